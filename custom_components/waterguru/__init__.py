@@ -2,63 +2,134 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import DOMAIN
-from .waterguru import WaterGuru, WaterGuruApiError, WaterGuruDevice
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .config import WaterGuruEntryConfig
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DATA_FETCH_MANAGER,
+    DATA_VALIDATED,
+    DOMAIN,
+    SERVICE_REFRESH,
+)
+from .coordinator import (
+    STORAGE_VERSION,
+    WaterGuruDataUpdateCoordinator,
+    WaterGuruFetchManager,
+)
+from .statistics import WaterGuruStatisticsImporter
+from .waterguru import WaterGuru
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
-INTERVAL = timedelta(minutes=30) # water temperature is updated every 30 minutes
+PLATFORMS: list[Platform] = [Platform.BUTTON, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+REFRESH_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+WaterGuruDataCoordinatorType = WaterGuruDataUpdateCoordinator
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the WaterGuru services."""
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Refresh one or all WaterGuru accounts."""
+        coordinators = {
+            entry_id: coordinator
+            for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+            if isinstance(coordinator, WaterGuruDataUpdateCoordinator)
+        }
+        if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is not None:
+            if entry_id not in coordinators:
+                raise ServiceValidationError(f"No loaded WaterGuru account for config entry {entry_id}")
+            coordinators = {entry_id: coordinators[entry_id]}
 
-WaterGuruDataCoordinatorType = DataUpdateCoordinator[dict[str, WaterGuruDevice]]
+        # rapid calls are merged by the debouncer of each coordinator
+        await asyncio.gather(*(coordinator.async_request_refresh() for coordinator in coordinators.values()))
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up WaterGuru from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
-
-    waterguru = WaterGuru(
-                    username=entry.data[CONF_USERNAME],
-                    password=entry.data[CONF_PASSWORD],
-                    session=async_get_clientsession(hass),
-                )
-
-    async def _update_method() -> dict[str, WaterGuru]:
-        """Get the latest data from WaterGuru."""
+    # shared by the config entries of all WaterGuru accounts
+    if (fetch_manager := hass.data[DOMAIN].get(DATA_FETCH_MANAGER)) is None:
+        fetch_manager = hass.data[DOMAIN][DATA_FETCH_MANAGER] = WaterGuruFetchManager(hass)
+
+    # the config flow hands over its logged in client and the dashboard it fetched
+    validated = hass.data[DOMAIN].get(DATA_VALIDATED, {}).pop(entry.data[CONF_USERNAME], None)
+    config = WaterGuruEntryConfig.from_options(entry.options)
+    if validated is not None:
+        waterguru, dashboard = validated
+        waterguru.set_config(config.api)
+    else:
+        waterguru = WaterGuru(
+                        username=entry.data[CONF_USERNAME],
+                        password=entry.data[CONF_PASSWORD],
+                        session=async_get_clientsession(hass),
+                        config=config.api,
+                    )
+
+    coordinator = WaterGuruDataUpdateCoordinator(hass, entry.entry_id, waterguru, fetch_manager, config)
+    await coordinator.statistics.async_load()
+    if validated is not None:
+        coordinator.async_set_validated_data(dashboard)
+    elif await coordinator.async_restore():
+        # entities start from the snapshot, the fetch manager polls right away in the background
+        coordinator.next_refresh = dt_util.utcnow()
+    else:
         try:
-            return await hass.async_add_executor_job(waterguru.get)
-        except WaterGuruApiError as err:
-            raise UpdateFailed(f"Unable to fetch data: {err}") from err
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=_update_method,
-        update_interval=INTERVAL,
-    )
-    await coordinator.async_config_entry_first_refresh()
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await waterguru.async_close()
+            raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    fetch_manager.async_add(entry.entry_id, coordinator)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the entry."""
+    coordinator: WaterGuruDataCoordinatorType = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_apply_config(WaterGuruEntryConfig.from_options(entry.options))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: WaterGuruDataCoordinatorType = hass.data[DOMAIN].pop(entry.entry_id)
+        if hass.data[DOMAIN][DATA_FETCH_MANAGER].async_remove(entry.entry_id):
+            hass.data[DOMAIN].pop(DATA_FETCH_MANAGER)
+        await coordinator.async_save_snapshot()
+        await coordinator.api.async_close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await WaterGuruStatisticsImporter(hass, entry.entry_id).async_remove()
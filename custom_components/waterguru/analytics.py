@@ -0,0 +1,129 @@
+"""Trends derived from recent WaterGuru readings."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+from .waterguru_device import WaterGuruDevice
+
+# readings kept per measurement, about a day and a half at the usual cadence
+WINDOW_SIZE = 12
+# pod values that are tracked to compute how fast they are used up
+DEPLETING_SENSORS = ("battery", "cassette")
+
+
+class WaterGuruSeries:
+    """Recent readings of one value with running sums.
+
+    Adding a reading and evicting the oldest one only update the sums, so
+    the mean and the least squares slope are computed in constant time.
+    """
+
+    __slots__ = ("_origin", "_points", "_n", "_sum_t", "_sum_v", "_sum_tt", "_sum_tv")
+
+    def __init__(self) -> None:
+        """Initialize the series."""
+        # times are stored in hours since the first reading to keep the sums small
+        self._origin: datetime | None = None
+        self._points: deque[tuple[float, float]] = deque()
+        self._n = 0
+        self._sum_t = 0.0
+        self._sum_v = 0.0
+        self._sum_tt = 0.0
+        self._sum_tv = 0.0
+
+    def add(self, measured: datetime, value: float) -> bool:
+        """Add a reading, return False if it is not newer than the last one."""
+        if self._origin is None:
+            self._origin = measured
+        t = (measured - self._origin).total_seconds() / 3600
+        if self._points and t <= self._points[-1][0]:
+            return False
+
+        if len(self._points) == WINDOW_SIZE:
+            self._update(*self._points.popleft(), -1)
+        self._points.append((t, value))
+        self._update(t, value, 1)
+        return True
+
+    def _update(self, t: float, value: float, sign: int) -> None:
+        """Add or remove a reading from the running sums."""
+        self._n += sign
+        self._sum_t += sign * t
+        self._sum_v += sign * value
+        self._sum_tt += sign * t * t
+        self._sum_tv += sign * t * value
+
+    @property
+    def latest(self) -> float | None:
+        """Return the latest reading."""
+        return self._points[-1][1] if self._points else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the readings."""
+        return self._sum_v / self._n if self._n else None
+
+    @property
+    def slope(self) -> float | None:
+        """Return the change per hour, None until there are two readings."""
+        if self._n < 2:
+            return None
+        denominator = self._n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (self._n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+
+    def hours_until(self, low: float | None, high: float | None) -> float | None:
+        """Return the hours until the trend leaves the low..high range.
+
+        0 if the latest reading is already outside, None if the trend does
+        not head towards a bound or there is no bound on that side.
+        """
+        if (latest := self.latest) is None or (slope := self.slope) is None:
+            return None
+        if (low is not None and latest < low) or (high is not None and latest > high):
+            return 0.0
+        if slope < 0 and low is not None:
+            return (latest - low) / -slope
+        if slope > 0 and high is not None:
+            return (high - latest) / slope
+        return None
+
+
+class WaterGuruAnalytics:
+    """Series of the measurements and pod values of an account."""
+
+    def __init__(self) -> None:
+        """Initialize the analytics."""
+        # (water body id, measurement type) or (pod id, sensor key) -> series
+        self._series: dict[tuple[str, str], WaterGuruSeries] = {}
+
+    def observe(self, devices: dict[str, WaterGuruDevice]) -> None:
+        """Add the new readings of the given devices."""
+        for device in devices.values():
+            for measurement in device.measurements.values():
+                if measurement.value is None or measurement.measure_time is None:
+                    continue
+                if (measured := dt_util.parse_datetime(measurement.measure_time)) is None:
+                    continue
+                self._series.setdefault((device.device_id, measurement.type), WaterGuruSeries()).add(
+                    measured, measurement.value
+                )
+
+            # the pods report their levels with each measurement of the water body
+            if device.last_measurement_time is None:
+                continue
+            if (measured := dt_util.parse_datetime(device.last_measurement_time)) is None:
+                continue
+            for pod in device.pods.values():
+                for key in DEPLETING_SENSORS:
+                    if (value := pod.sensors.get(key)) is not None:
+                        self._series.setdefault((pod.pod_id, key), WaterGuruSeries()).add(measured, value)
+
+    def series(self, owner_id: str, key: str) -> WaterGuruSeries | None:
+        """Return the series of a measurement or pod value."""
+        return self._series.get((owner_id, key))
@@ -0,0 +1,87 @@
+"""Support for WaterGuru buttons."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import WaterGuruDataCoordinatorType
+from .const import DOMAIN
+from .device import water_body_device_info
+from .waterguru import WaterGuruDevice
+
+REFRESH_BUTTON = ButtonEntityDescription(
+    key="refresh",
+    translation_key="refresh",
+    name="Refresh",
+    icon="mdi:refresh",
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the WaterGuru buttons."""
+
+    coordinator: WaterGuruDataCoordinatorType = hass.data[DOMAIN][entry.entry_id]
+    known_device_ids: set[str] = set()
+
+    @callback
+    def _async_add_new_entities(device_ids: Iterable[str]) -> None:
+        """Add a refresh button for each new water body."""
+        new_device_ids = [
+            device_id
+            for device_id in device_ids
+            if device_id in coordinator.data and device_id not in known_device_ids
+        ]
+        known_device_ids.update(new_device_ids)
+        if new_device_ids:
+            async_add_entities(
+                WaterGuruRefreshButton(coordinator, coordinator.data[device_id], REFRESH_BUTTON)
+                for device_id in new_device_ids
+            )
+
+    @callback
+    def _async_discover() -> None:
+        """Add buttons for new water bodies."""
+        _async_add_new_entities(coordinator.changed_device_ids)
+
+    _async_add_new_entities(list(coordinator.data))
+    entry.async_on_unload(coordinator.async_add_listener(_async_discover))
+
+
+class WaterGuruRefreshButton(
+    CoordinatorEntity[WaterGuruDataCoordinatorType], ButtonEntity
+):
+    """Button that fetches the latest data of the account."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: WaterGuruDataCoordinatorType,
+        waterguru_device: WaterGuruDevice,
+        entity_description: ButtonEntityDescription,
+    ) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator)
+
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{waterguru_device.device_id}_{entity_description.key}"
+        self._attr_device_info = water_body_device_info(waterguru_device)
+
+    @property
+    def available(self) -> bool:
+        """Return True, a refresh can be requested even after a failed poll."""
+        return True
+
+    async def async_press(self) -> None:
+        """Request a refresh, merged with other requests made shortly before."""
+        await self.coordinator.async_request_refresh()
@@ -0,0 +1,77 @@
+"""Settings of a WaterGuru config entry."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from .const import (
+    CONF_CLIENT_ID,
+    CONF_DEADBAND_STEPS,
+    CONF_EXPIRY_MARGIN,
+    CONF_IDENTITY_POOL_ID,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_SILENCE,
+    CONF_MIN_INTERVAL,
+    CONF_POOL_ID,
+    CONF_REFRESH_COOLDOWN,
+    CONF_REGION,
+    CONF_REQUEST_TIMEOUT,
+    CONF_RETRY_ATTEMPTS,
+    DEFAULT_DEADBAND_STEPS,
+    DEFAULT_MAX_SILENCE,
+)
+from .resilience import RETRY_ATTEMPTS
+from .scheduler import MAX_INTERVAL, MIN_INTERVAL
+from .waterguru import WaterGuruApiConfig
+
+# seconds, minimum spacing between refreshes requested by the service and the buttons
+DEFAULT_REFRESH_COOLDOWN = 60
+
+
+@dataclass(frozen=True, slots=True)
+class WaterGuruEntryConfig:
+    """Settings of an account, built from the options of its config entry."""
+
+    api: WaterGuruApiConfig = field(default_factory=WaterGuruApiConfig)
+    min_interval: timedelta = MIN_INTERVAL
+    max_interval: timedelta = MAX_INTERVAL
+    retry_attempts: int = RETRY_ATTEMPTS
+    # seconds
+    refresh_cooldown: float = DEFAULT_REFRESH_COOLDOWN
+    deadband_steps: int = DEFAULT_DEADBAND_STEPS
+    max_silence: timedelta = timedelta(minutes=DEFAULT_MAX_SILENCE)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> WaterGuruEntryConfig:
+        """Build the settings from the options, missing ones keep their default.
+
+        Intervals and margins are stored in minutes, timeouts in seconds.
+        """
+        default = cls()
+        api = default.api
+        return cls(
+            api=WaterGuruApiConfig(
+                region=options.get(CONF_REGION, api.region),
+                pool_id=options.get(CONF_POOL_ID, api.pool_id),
+                identity_pool_id=options.get(CONF_IDENTITY_POOL_ID, api.identity_pool_id),
+                client_id=options.get(CONF_CLIENT_ID, api.client_id),
+                request_timeout=options.get(CONF_REQUEST_TIMEOUT, api.request_timeout),
+                expiry_margin=_minutes(options, CONF_EXPIRY_MARGIN, api.expiry_margin),
+            ),
+            min_interval=_minutes(options, CONF_MIN_INTERVAL, default.min_interval),
+            max_interval=_minutes(options, CONF_MAX_INTERVAL, default.max_interval),
+            retry_attempts=options.get(CONF_RETRY_ATTEMPTS, default.retry_attempts),
+            refresh_cooldown=options.get(CONF_REFRESH_COOLDOWN, default.refresh_cooldown),
+            deadband_steps=options.get(CONF_DEADBAND_STEPS, default.deadband_steps),
+            max_silence=_minutes(options, CONF_MAX_SILENCE, default.max_silence),
+        )
+
+
+def _minutes(options: Mapping[str, Any], key: str, default: timedelta) -> timedelta:
+    """Return an option stored in minutes."""
+    if (value := options.get(key)) is None:
+        return default
+    return timedelta(minutes=value)
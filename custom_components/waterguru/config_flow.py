@@ -4,12 +4,34 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
-from .waterguru import WaterGuru, WaterGuruApiError
+from .config import WaterGuruEntryConfig
+from .const import (
+    CONF_CLIENT_ID,
+    CONF_DEADBAND_STEPS,
+    CONF_EXPIRY_MARGIN,
+    CONF_IDENTITY_POOL_ID,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_SILENCE,
+    CONF_MIN_INTERVAL,
+    CONF_POOL_ID,
+    CONF_REFRESH_COOLDOWN,
+    CONF_REGION,
+    CONF_REQUEST_TIMEOUT,
+    CONF_RETRY_ATTEMPTS,
+    DATA_VALIDATED,
+    DOMAIN,
+)
+from .waterguru import WaterGuru, WaterGuruApiError, WaterGuruAuthError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +49,12 @@ class WaterguruConfigFlow(ConfigFlow, domain=DOMAIN):
 
     DOMAIN = DOMAIN
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return WaterguruOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -37,27 +65,105 @@ class WaterguruConfigFlow(ConfigFlow, domain=DOMAIN):
                 user_input[CONF_USERNAME] = user_input[CONF_USERNAME].lower()
 
             self._async_abort_entries_match({CONF_USERNAME: user_input[CONF_USERNAME]})
+            await self.async_set_unique_id(user_input[CONF_USERNAME])
+            self._abort_if_unique_id_configured()
 
+            waterguru = WaterGuru(
+                username=user_input[CONF_USERNAME],
+                password=user_input[CONF_PASSWORD],
+                session=async_get_clientsession(self.hass),
+            )
             try:
-                waterguru = WaterGuru(
-                    username=user_input[CONF_USERNAME],
-                    password=user_input[CONF_PASSWORD],
-                    session=async_get_clientsession(self.hass),
-                )
-                data = await self.hass.async_add_executor_job(waterguru.get)
+                dashboard = await waterguru.async_get_dashboard()
+                waterguru.parse_dashboard(dashboard)
+            except WaterGuruAuthError:
+                errors["base"] = "invalid_auth"
             except WaterGuruApiError:
                 errors["base"] = "cannot_connect"
             else:
-                await self.async_set_unique_id(user_input[CONF_USERNAME])
-                self._abort_if_unique_id_configured()
-
+                # the entry setup reuses the login and the dashboard instead of fetching them again
+                self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_VALIDATED, {})[
+                    user_input[CONF_USERNAME]
+                ] = (waterguru, dashboard)
                 return self.async_create_entry(
                     title=f"WaterGuru: {user_input[CONF_USERNAME]}",
                     data=user_input,
                 )
+            await waterguru.async_close()
 
         return self.async_show_form(
             step_id="user",
             data_schema=WATERGURU_SCHEMA,
             errors=errors,
         )
+
+
+class WaterguruOptionsFlow(OptionsFlow):
+    """Waterguru options flow."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            else:
+                # keep the advanced options when they were not shown
+                return self.async_create_entry(data={**self._entry.options, **user_input})
+
+        config = WaterGuruEntryConfig.from_options(self._entry.options)
+        schema = {
+            vol.Required(
+                CONF_MIN_INTERVAL,
+                default=int(config.min_interval.total_seconds() // 60),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60)),
+            vol.Required(
+                CONF_MAX_INTERVAL,
+                default=int(config.max_interval.total_seconds() // 60),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60)),
+            vol.Required(
+                CONF_REQUEST_TIMEOUT,
+                default=config.api.request_timeout,
+            ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+            vol.Required(
+                CONF_RETRY_ATTEMPTS,
+                default=config.retry_attempts,
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            vol.Required(
+                CONF_REFRESH_COOLDOWN,
+                default=config.refresh_cooldown,
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+            vol.Required(
+                CONF_EXPIRY_MARGIN,
+                default=int(config.api.expiry_margin.total_seconds() // 60),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=30)),
+            vol.Required(
+                CONF_DEADBAND_STEPS,
+                default=config.deadband_steps,
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+            vol.Required(
+                CONF_MAX_SILENCE,
+                default=int(config.max_silence.total_seconds() // 60),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60)),
+        }
+        if self.show_advanced_options:
+            schema.update(
+                {
+                    vol.Required(CONF_REGION, default=config.api.region): str,
+                    vol.Required(CONF_POOL_ID, default=config.api.pool_id): str,
+                    vol.Required(CONF_IDENTITY_POOL_ID, default=config.api.identity_pool_id): str,
+                    vol.Required(CONF_CLIENT_ID, default=config.api.client_id): str,
+                }
+            )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(schema),
+            errors=errors,
+        )
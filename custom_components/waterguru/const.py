@@ -4,6 +4,33 @@ from enum import StrEnum
 
 DOMAIN = "waterguru"
 
+DATA_FETCH_MANAGER = "fetch_manager"
+# accounts validated by the config flow, keyed by username, waiting for their entry to be set up
+DATA_VALIDATED = "validated"
+
+# options of an entry, see config.py for their defaults
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_RETRY_ATTEMPTS = "retry_attempts"
+CONF_EXPIRY_MARGIN = "expiry_margin"
+CONF_REFRESH_COOLDOWN = "refresh_cooldown"
+CONF_REGION = "region"
+CONF_POOL_ID = "pool_id"
+CONF_IDENTITY_POOL_ID = "identity_pool_id"
+CONF_CLIENT_ID = "client_id"
+
+# significant-change filtering of the numeric sensors
+CONF_DEADBAND_STEPS = "deadband_steps"
+CONF_MAX_SILENCE = "max_silence"
+# 0 writes every change
+DEFAULT_DEADBAND_STEPS = 0
+# minutes
+DEFAULT_MAX_SILENCE = 60
+
+SERVICE_REFRESH = "refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
 class WaterGuruEntityAttributes(StrEnum):
   """Possible entity attributes."""
 
@@ -11,3 +38,7 @@ class WaterGuruEntityAttributes(StrEnum):
   DESC = "description"
   STATUS_COLOR = "status_color"
   ADVICE = "advice"
+  MEASUREMENT_INTERVAL = "measurement_interval"
+  PHASES = "phases"
+  COUNTERS = "counters"
+  STALE = "stale"
@@ -0,0 +1,319 @@
+"""DataUpdateCoordinator for WaterGuru."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+import logging
+import random
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .analytics import WaterGuruAnalytics
+from .config import WaterGuruEntryConfig
+from .const import DOMAIN
+from .resilience import WaterGuruCircuitBreaker, async_call_with_retry
+from .scheduler import WaterGuruPollScheduler
+from .statistics import WaterGuruStatisticsImporter
+from .waterguru import WaterGuru, WaterGuruApiError, WaterGuruDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# accounts polled at the same time
+MAX_CONCURRENT_FETCHES = 2
+# accounts due within this window are refreshed in the same batch
+BATCH_WINDOW = timedelta(minutes=1)
+# spread the start of the polls in a batch over this many seconds
+FETCH_JITTER = 10
+# keep serving the last good data this long while the API is failing
+STALE_AFTER = timedelta(hours=2)
+
+STORAGE_VERSION = 1
+# delay writing the snapshot a little so back-to-back refreshes are saved once
+SNAPSHOT_SAVE_DELAY = 10
+# polls kept for diagnostics
+POLL_HISTORY_SIZE = 20
+
+
+class WaterGuruFetchManager:
+    """Schedule and run the polls of all WaterGuru accounts together.
+
+    The coordinators do not schedule themselves. The manager wakes up when
+    the first account is due, refreshes every account due within the batch
+    window with jittered start times, and lets at most
+    MAX_CONCURRENT_FETCHES of them talk to the API at once.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the fetch manager."""
+        self.hass = hass
+        self._coordinators: dict[str, WaterGuruDataUpdateCoordinator] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._batch_running = False
+
+    @callback
+    def async_add(self, entry_id: str, coordinator: WaterGuruDataUpdateCoordinator) -> None:
+        """Start scheduling the polls of an account."""
+        self._coordinators[entry_id] = coordinator
+        self.async_schedule()
+
+    @callback
+    def async_remove(self, entry_id: str) -> bool:
+        """Stop scheduling the polls of an account, return True if none are left."""
+        self._coordinators.pop(entry_id, None)
+        self.async_schedule()
+        return not self._coordinators
+
+    @callback
+    def async_schedule(self) -> None:
+        """Schedule the next batch for the earliest account due."""
+        if self._batch_running:
+            # rescheduled once the running batch is done
+            return
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+        if not self._coordinators:
+            return
+
+        next_refresh = min(coordinator.next_refresh for coordinator in self._coordinators.values())
+        self._unsub_refresh = async_track_point_in_utc_time(self.hass, self._async_refresh_due, next_refresh)
+
+    async def _async_refresh_due(self, now: datetime) -> None:
+        """Refresh all accounts that are due."""
+        self._unsub_refresh = None
+        due = [
+            coordinator
+            for coordinator in self._coordinators.values()
+            if coordinator.next_refresh <= now + BATCH_WINDOW
+        ]
+        self._batch_running = True
+        try:
+            await asyncio.gather(*(self._async_refresh(coordinator, len(due) > 1) for coordinator in due))
+        finally:
+            self._batch_running = False
+            self.async_schedule()
+
+    async def _async_refresh(self, coordinator: WaterGuruDataUpdateCoordinator, jitter: bool) -> None:
+        """Refresh one account."""
+        if jitter:
+            await asyncio.sleep(random.uniform(0, FETCH_JITTER))
+        await coordinator.async_refresh()
+
+    async def async_fetch(self, api: WaterGuru) -> dict[str, Any]:
+        """Fetch the dashboard of an account once a slot is free."""
+        async with self._semaphore:
+            return await api.async_get_dashboard()
+
+
+class WaterGuruDataUpdateCoordinator(DataUpdateCoordinator[dict[str, WaterGuruDevice]]):
+    """Coordinator that polls the WaterGuru API for one account."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        api: WaterGuru,
+        fetch_manager: WaterGuruFetchManager,
+        config: WaterGuruEntryConfig | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        self.api = api
+        self.config = config or WaterGuruEntryConfig()
+        # the last good dashboard and the auth cache, used to start without waiting for the cloud
+        self.store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._saved_auth_state: dict[str, Any] | None = None
+        # the snapshot waiting for the delayed save
+        self._pending_snapshot: dict[str, Any] | None = None
+        self.statistics = WaterGuruStatisticsImporter(hass, entry_id)
+        self.analytics = WaterGuruAnalytics()
+        # True while the entities show restored or last good data instead of a fresh poll
+        self.stale = False
+        self.scheduler = WaterGuruPollScheduler(
+            min_interval=self.config.min_interval, max_interval=self.config.max_interval
+        )
+        self.breaker = WaterGuruCircuitBreaker()
+        self.last_success_time: datetime | None = None
+        self.next_refresh = dt_util.utcnow() + self.scheduler.default_interval
+        # water bodies whose payload changed in the last refresh
+        self.changed_device_ids: set[str] = set()
+        # bumped whenever the data is replaced by a fetched or restored dashboard
+        self.generation = 0
+        # outcome of the recent polls, newest last
+        self.poll_history: deque[dict[str, Any]] = deque(maxlen=POLL_HISTORY_SIZE)
+        self._fetch_manager = fetch_manager
+        # the dashboard fetch in progress, joined by refreshes started meanwhile
+        self._fetch_task: asyncio.Task[dict[str, Any]] | None = None
+        self._refresh_debouncer = Debouncer(
+            hass, _LOGGER, cooldown=self.config.refresh_cooldown, immediate=True
+        )
+        # polls are scheduled by the fetch manager, on demand refreshes are coalesced
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            request_refresh_debouncer=self._refresh_debouncer,
+        )
+
+    async def _async_update_data(self) -> dict[str, WaterGuruDevice]:
+        """Get the latest data from WaterGuru."""
+        self.changed_device_ids = set()
+        now = dt_util.utcnow()
+        # moved again below; an unexpected error, which DataUpdateCoordinator only logs,
+        # must not leave next_refresh in the past and poll in a tight loop
+        self.next_refresh = now + self.scheduler.default_interval
+        if self.breaker.is_open(now):
+            self._async_set_next_refresh(self.breaker.opened_at + self.breaker.cooldown - now)
+            return self._last_good_data(now, "polls are paused after repeated failures")
+
+        try:
+            dashboard = await async_call_with_retry(self._async_fetch, self.config.retry_attempts)
+            data = self.api.parse_dashboard(dashboard)
+        except WaterGuruApiError as err:
+            self.poll_history.append({"time": now.isoformat(), "error": str(err)})
+            self.breaker.record_failure(now)
+            if self.breaker.is_open(now):
+                self._async_set_next_refresh(self.breaker.cooldown)
+            else:
+                self._async_set_next_refresh(
+                    min(self.scheduler.default_interval, self.scheduler.min_interval * 2 ** (self.breaker.failures - 1))
+                )
+            return self._last_good_data(now, err)
+
+        return self._async_handle_dashboard(now, dashboard, data)
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Fetch the dashboard, or wait for the fetch already in progress."""
+        if self._fetch_task is None:
+            self._fetch_task = self.hass.async_create_task(self._fetch_manager.async_fetch(self.api))
+            self._fetch_task.add_done_callback(self._async_fetch_done)
+        return await asyncio.shield(self._fetch_task)
+
+    @callback
+    def _async_fetch_done(self, task: asyncio.Task[dict[str, Any]]) -> None:
+        """Let the next refresh start a new fetch."""
+        self._fetch_task = None
+
+    @callback
+    def _async_handle_dashboard(
+        self, now: datetime, dashboard: dict[str, Any], data: dict[str, WaterGuruDevice]
+    ) -> dict[str, WaterGuruDevice]:
+        """Record a successful fetch and return the devices."""
+        self.breaker.record_success()
+        self.last_success_time = now
+        self.stale = False
+        self.generation += 1
+
+        with self.api.metrics.timed("change_detection"):
+            previous = self.data or {}
+            self.changed_device_ids = {
+                device_id
+                for device_id, device in data.items()
+                if device_id not in previous or previous[device_id].fingerprint != device.fingerprint
+            } | (previous.keys() - data.keys())
+
+            self.scheduler.observe(data)
+        self._async_set_next_refresh(self.scheduler.next_interval())
+        self.poll_history.append(
+            {
+                "time": now.isoformat(),
+                "changed": len(self.changed_device_ids),
+                "duration_ms": self.api.metrics.as_dict()["last_poll_ms"].get("total"),
+            }
+        )
+
+        if self.changed_device_ids:
+            changed = {device_id: data[device_id] for device_id in self.changed_device_ids if device_id in data}
+            self.statistics.async_import(changed)
+            with self.api.metrics.timed("analytics"):
+                self.analytics.observe(changed)
+
+        auth_state = self.api.auth_state
+        if self.changed_device_ids or auth_state != self._saved_auth_state:
+            self._saved_auth_state = auth_state
+            self._pending_snapshot = {"fetched_at": now.isoformat(), "dashboard": dashboard, "auth": auth_state}
+            self.store.async_delay_save(self._take_snapshot, SNAPSHOT_SAVE_DELAY)
+        return data
+
+    @callback
+    def _take_snapshot(self) -> dict[str, Any] | None:
+        """Hand the pending snapshot to the store as it writes it."""
+        snapshot, self._pending_snapshot = self._pending_snapshot, None
+        return snapshot
+
+    async def async_save_snapshot(self) -> None:
+        """Write the pending snapshot now instead of after the delay.
+
+        Called on unload, so a reload within the delay still starts from the
+        latest dashboard and tokens instead of logging in again.
+        """
+        if self._pending_snapshot is not None:
+            await self.store.async_save(self._take_snapshot())
+
+    async def async_restore(self) -> bool:
+        """Load the last good snapshot, return True if the entities can be set up from it."""
+        if (snapshot := await self.store.async_load()) is None:
+            return False
+
+        self.api.restore_auth_state(snapshot.get("auth") or {})
+        self._saved_auth_state = self.api.auth_state
+        try:
+            data = self.api.parse_dashboard(snapshot["dashboard"])
+            fetched_at = dt_util.parse_datetime(snapshot["fetched_at"])
+        except (KeyError, TypeError, WaterGuruApiError) as err:
+            _LOGGER.debug("Ignoring unusable WaterGuru snapshot: %s", err)
+            return False
+
+        self.scheduler.observe(data)
+        self.analytics.observe(data)
+        self.generation += 1
+        self.last_success_time = fetched_at
+        self.stale = True
+        self.changed_device_ids = set(data)
+        self.async_set_updated_data(data)
+        return True
+
+    @callback
+    def async_set_validated_data(self, dashboard: dict[str, Any]) -> None:
+        """Start from the dashboard fetched while validating the account in the config flow."""
+        data = self.api.parse_dashboard(dashboard)
+        self.changed_device_ids = set()
+        self.async_set_updated_data(self._async_handle_dashboard(dt_util.utcnow(), dashboard, data))
+
+    @callback
+    def async_apply_config(self, config: WaterGuruEntryConfig) -> None:
+        """Apply new settings without recreating the coordinator."""
+        previous, self.config = self.config, config
+        self.api.set_config(config.api)
+        self._refresh_debouncer.cooldown = config.refresh_cooldown
+        if (previous.min_interval, previous.max_interval) == (config.min_interval, config.max_interval):
+            return
+
+        self.scheduler.min_interval = config.min_interval
+        self.scheduler.max_interval = config.max_interval
+        if self.last_update_success and not self.breaker.is_open(dt_util.utcnow()):
+            self._async_set_next_refresh(self.scheduler.next_interval())
+
+    def _last_good_data(self, now: datetime, err: Exception | str) -> dict[str, WaterGuruDevice]:
+        """Return the previous data if it is recent enough, otherwise fail the update."""
+        if self.data is not None and self.last_success_time is not None and now - self.last_success_time < STALE_AFTER:
+            _LOGGER.debug("Unable to fetch data, keeping data from %s: %s", self.last_success_time, err)
+            self.stale = True
+            return self.data
+        raise UpdateFailed(f"Unable to fetch data: {err}")
+
+    @callback
+    def _async_set_next_refresh(self, delay: timedelta) -> None:
+        """Set when the account should be polled next."""
+        self.next_refresh = dt_util.utcnow() + delay
+        _LOGGER.debug("Next WaterGuru poll at %s", self.next_refresh)
+        # also covers refreshes that were not started by the fetch manager
+        self._fetch_manager.async_schedule()
@@ -0,0 +1,37 @@
+"""Device registry entries of the WaterGuru water bodies and pods."""
+
+from __future__ import annotations
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+from .waterguru_device import WaterGuruDevice, WaterGuruPod
+
+
+def water_body_device_info(waterguru_device: WaterGuruDevice) -> DeviceInfo:
+    """Return the device info of a water body.
+
+    Every platform passes the full info, so the device is named by whichever
+    platform sets up first.
+    """
+    return DeviceInfo(
+        identifiers={(DOMAIN, waterguru_device.device_id)},
+        name=waterguru_device.name,
+        manufacturer="WaterGuru",
+        model=waterguru_device.product_name,
+        suggested_area="Pool",
+    )
+
+
+def pod_device_info(waterguru_device: WaterGuruDevice, pod: WaterGuruPod) -> DeviceInfo:
+    """Return the device info of a pod, linked to its water body."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"pod_{pod.pod_id}")},
+        name=f"{waterguru_device.name} Pod {pod.pod_id}",
+        manufacturer="WaterGuru",
+        model=pod.product,
+        suggested_area="Pool",
+        serial_number=pod.pod_id,
+        sw_version=pod.firmware_version,
+        via_device=(DOMAIN, waterguru_device.device_id),
+    )
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import json
 from typing import Any
+from weakref import WeakKeyDictionary
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
@@ -11,19 +13,57 @@ from homeassistant.core import HomeAssistant
 from . import WaterGuruDataCoordinatorType
 from .const import DOMAIN
 
-TO_REDACT = {
-    "serial_number",
-    "url",
-    "waterBodyId",
-    "userId",
-    "addr1",
-    "city",
-    "state",
-    "zip",
-    "imageUrl",
-    "ipAddr",
-    "wifiId"
-}
+TO_REDACT = frozenset(
+    {
+        "serial_number",
+        "pod_id",
+        "podId",
+        "url",
+        "waterBodyId",
+        "userId",
+        "addr1",
+        "city",
+        "state",
+        "zip",
+        "imageUrl",
+        "ipAddr",
+        "wifiId",
+    }
+)
+
+# the raw water bodies are cut off once their encoded size reaches this many characters
+RAW_DATA_MAX_SIZE = 256 * 1024
+
+# redacted devices and raw data per coordinator, with the generation they were built from
+_CACHE: WeakKeyDictionary[WaterGuruDataCoordinatorType, tuple[int, dict[str, Any]]] = WeakKeyDictionary()
+
+
+async def _async_redacted_data(coordinator: WaterGuruDataCoordinatorType) -> dict[str, Any]:
+    """Return the redacted devices and raw data, built once per generation."""
+    if (cached := _CACHE.get(coordinator)) is not None and cached[0] == coordinator.generation:
+        return cached[1]
+
+    # the devices do not keep the raw payload, it is read from the last saved snapshot
+    generation = coordinator.generation
+    snapshot = await coordinator.store.async_load() or {}
+    raw_data: list[Any] = []
+    size = 0
+    water_bodies = (snapshot.get("dashboard") or {}).get("waterBodies") or []
+    for water_body in water_bodies:
+        redacted = async_redact_data(water_body, TO_REDACT)
+        size += len(json.dumps(redacted, default=str))
+        if size > RAW_DATA_MAX_SIZE:
+            break
+        raw_data.append(redacted)
+
+    data = {
+        "devices": [async_redact_data(device.diagnostics, TO_REDACT) for device in coordinator.data.values()],
+        "raw_data": raw_data,
+        "raw_data_truncated": len(water_bodies) - len(raw_data),
+    }
+    _CACHE[coordinator] = (generation, data)
+    return data
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
@@ -31,4 +71,22 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     coordinator: WaterGuruDataCoordinatorType = hass.data[DOMAIN][entry.entry_id]
 
-    return async_redact_data([device.diagnostics for device in coordinator.data.values()], TO_REDACT)
+    return {
+        **await _async_redacted_data(coordinator),
+        "generation": coordinator.generation,
+        "poll_schedule": {
+            "next_refresh": coordinator.next_refresh.isoformat(),
+            **coordinator.scheduler.diagnostics,
+            # seconds, in the order of the devices since the water body ids are redacted
+            "cadence": [
+                cadence.total_seconds() if (cadence := coordinator.scheduler.cadence(device_id)) is not None else None
+                for device_id in coordinator.data
+            ],
+        },
+        "poll_history": list(coordinator.poll_history),
+        "metrics": coordinator.api.metrics.as_dict(),
+        "auth_cache": coordinator.api.auth_diagnostics,
+        "circuit_breaker": coordinator.breaker.diagnostics,
+        "stale": coordinator.stale,
+        "last_success_time": coordinator.last_success_time.isoformat() if coordinator.last_success_time else None,
+    }
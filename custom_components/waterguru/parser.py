@@ -0,0 +1,111 @@
+"""Decode and validate the WaterGuru dashboard payload."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from .waterguru_device import WaterGuruDevice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+NUMBER = vol.Any(int, float, None)
+
+REFILLABLE_SCHEMA = vol.Schema(
+    {
+        vol.Required("type"): str,
+        vol.Optional("pctLeft"): NUMBER,
+        # "3 weeks", "2 months", ...
+        vol.Optional("timeLeftText"): vol.All(str, vol.Match(r"^\d+\b")),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+POD_SCHEMA = vol.Schema(
+    {
+        vol.Required("pod"): vol.Schema({vol.Required("podId"): vol.Any(str, int)}, extra=vol.ALLOW_EXTRA),
+        vol.Optional("rssiInfo"): vol.Any(vol.Schema({vol.Optional("rssi"): NUMBER}, extra=vol.ALLOW_EXTRA), None),
+        vol.Optional("refillables"): vol.Any([REFILLABLE_SCHEMA], None),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+MEASUREMENT_SCHEMA = vol.Schema(
+    {
+        vol.Required("type"): str,
+        vol.Required("title"): str,
+        vol.Optional("floatValue"): NUMBER,
+        vol.Optional("intValue"): NUMBER,
+        vol.Optional("cfg"): vol.Any(
+            vol.Schema(
+                {
+                    vol.Optional("decPlaces"): vol.Any(int, None),
+                    vol.Optional("idealMin"): NUMBER,
+                    vol.Optional("idealMax"): NUMBER,
+                },
+                extra=vol.ALLOW_EXTRA,
+            ),
+            None,
+        ),
+        vol.Optional("alerts"): vol.Any([dict], None),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+WATER_BODY_SCHEMA = vol.Schema(
+    {
+        vol.Required("waterBodyId"): str,
+        vol.Required("name"): str,
+        vol.Required("status"): vol.Any(str, None),
+        vol.Optional("waterTemp"): NUMBER,
+        vol.Optional("pods"): [POD_SCHEMA],
+        vol.Optional("measurements"): [MEASUREMENT_SCHEMA],
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+def json_loads(raw: bytes) -> Any:
+    """Decode a JSON body, with orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def fingerprint(data: Any) -> bytes:
+    """Return a stable encoding of a payload, used to detect changes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True).encode("utf-8")
+
+
+def parse_water_bodies(data: Any) -> tuple[dict[str, WaterGuruDevice], int]:
+    """Build the devices of a dashboard payload.
+
+    Each water body is validated and parsed on its own, a malformed one is
+    logged and skipped. Returns the devices and the number of water bodies
+    skipped. Raises vol.Invalid if the payload has no water bodies list.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("waterBodies"), list):
+        raise vol.Invalid("expected a list of waterBodies")
+
+    devices: dict[str, WaterGuruDevice] = {}
+    skipped = 0
+    for index, waterBodyData in enumerate(data["waterBodies"]):
+        try:
+            WATER_BODY_SCHEMA(waterBodyData)
+            device = WaterGuruDevice(waterBodyData, fingerprint(waterBodyData))
+        except (vol.Invalid, AttributeError, KeyError, IndexError, TypeError, ValueError) as e:
+            _LOGGER.warning("Skipping malformed WaterGuru water body #%s: %s", index, e)
+            skipped += 1
+            continue
+        devices[device.device_id] = device
+    return devices, skipped
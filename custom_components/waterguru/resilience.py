@@ -0,0 +1,105 @@
+"""Retry and circuit breaker helpers for the WaterGuru API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+import logging
+import random
+from typing import Any, TypeVar
+
+from .waterguru import WaterGuruApiError, WaterGuruAuthError, WaterGuruThrottledError
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0
+# AWS asks for a longer pause when it throttles
+THROTTLED_BASE_DELAY = 10.0
+RETRY_MAX_DELAY = 60.0
+
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = timedelta(minutes=30)
+
+
+def backoff_delay(attempt: int, base: float, maximum: float = RETRY_MAX_DELAY) -> float:
+    """Return an exponential backoff delay with full jitter."""
+    return random.uniform(0, min(maximum, base * 2**attempt))
+
+
+async def async_call_with_retry(
+    func: Callable[[], Awaitable[_T]],
+    attempts: int = RETRY_ATTEMPTS,
+) -> _T:
+    """Call func, retrying transient WaterGuru API errors with backoff.
+
+    Rejected credentials are not retried.
+    """
+    for attempt in range(attempts):
+        try:
+            return await func()
+        except WaterGuruAuthError:
+            raise
+        except WaterGuruThrottledError as err:
+            if attempt + 1 >= attempts:
+                raise
+            delay = backoff_delay(attempt, THROTTLED_BASE_DELAY)
+            _LOGGER.debug("WaterGuru API throttled (%s), retrying in %.1fs", err, delay)
+        except WaterGuruApiError as err:
+            if attempt + 1 >= attempts:
+                raise
+            delay = backoff_delay(attempt, RETRY_BASE_DELAY)
+            _LOGGER.debug("WaterGuru API error (%s), retrying in %.1fs", err, delay)
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+class WaterGuruCircuitBreaker:
+    """Stop calling the API for a while after repeated failed polls."""
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        cooldown: timedelta = BREAKER_COOLDOWN,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: datetime | None = None
+
+    def is_open(self, now: datetime) -> bool:
+        """Return True while calls should be skipped.
+
+        Once the cooldown has passed one trial call is let through; another
+        failure opens the breaker again.
+        """
+        return self.opened_at is not None and now < self.opened_at + self.cooldown
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self, now: datetime) -> None:
+        """Count a failed poll and open the breaker if there were too many."""
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                _LOGGER.warning(
+                    "WaterGuru API failed %s times in a row, pausing polls for %s",
+                    self.failures,
+                    self.cooldown,
+                )
+            self.opened_at = now
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "failures": self.failures,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+        }
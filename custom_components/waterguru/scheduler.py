@@ -0,0 +1,91 @@
+"""Adaptive poll scheduling for WaterGuru."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from statistics import median
+
+from homeassistant.util import dt as dt_util
+
+from .waterguru_device import WaterGuruDevice
+
+DEFAULT_INTERVAL = timedelta(minutes=30)
+MIN_INTERVAL = timedelta(minutes=5)
+MAX_INTERVAL = timedelta(hours=2)
+# poll this long after a measurement is expected, the cloud needs a moment to publish it
+POLL_GRACE = timedelta(minutes=2)
+HISTORY_SIZE = 8
+
+
+class WaterGuruPollScheduler:
+    """Learn how often each water body is measured and pick the next poll time."""
+
+    def __init__(
+        self,
+        default_interval: timedelta = DEFAULT_INTERVAL,
+        min_interval: timedelta = MIN_INTERVAL,
+        max_interval: timedelta = MAX_INTERVAL,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._last_measurement: dict[str, datetime] = {}
+        self._intervals: dict[str, deque[float]] = {}
+        self._misses = 0
+
+    def observe(self, devices: dict[str, WaterGuruDevice]) -> bool:
+        """Record the latest measurement times, return True if any changed."""
+        changed = False
+        for device_id, device in devices.items():
+            if device.last_measurement_time is None:
+                continue
+            measured = dt_util.parse_datetime(device.last_measurement_time)
+            if measured is None:
+                continue
+            previous = self._last_measurement.get(device_id)
+            if previous is not None and measured <= previous:
+                continue
+            if previous is not None:
+                self._intervals.setdefault(device_id, deque(maxlen=HISTORY_SIZE)).append(
+                    (measured - previous).total_seconds()
+                )
+            self._last_measurement[device_id] = measured
+            changed = True
+
+        self._misses = 0 if changed else self._misses + 1
+        return changed
+
+    def cadence(self, device_id: str) -> timedelta | None:
+        """Return the learned time between two measurements of a water body."""
+        if not (intervals := self._intervals.get(device_id)):
+            return None
+        return timedelta(seconds=median(intervals))
+
+    def next_interval(self, now: datetime | None = None) -> timedelta:
+        """Return how long to wait before the next poll."""
+        now = now or dt_util.utcnow()
+        delays: list[timedelta] = []
+        for device_id, measured in self._last_measurement.items():
+            if (cadence := self.cadence(device_id)) is None:
+                continue
+            delay = measured + cadence + POLL_GRACE - now
+            if delay <= timedelta(0):
+                # the measurement is late, back off while nothing new shows up
+                delay = self.min_interval * 2 ** min(self._misses, 6)
+            delays.append(delay)
+
+        delay = min(delays) if delays else self.default_interval
+        return max(self.min_interval, min(self.max_interval, delay))
+
+    @property
+    def diagnostics(self) -> dict[str, object]:
+        """Return the learned schedule for diagnostics.
+
+        The cadences are keyed by water body id, which diagnostics redact, so
+        they are left to the caller.
+        """
+        return {
+            "misses": self._misses,
+        }
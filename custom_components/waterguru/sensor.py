@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+from abc import abstractmethod
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -15,18 +21,23 @@ from homeassistant.const import (
     PERCENTAGE,
     SIGNAL_STRENGTH_DECIBELS,
     EntityCategory,
+    Platform,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from . import WaterGuruDataCoordinatorType
+from .analytics import WaterGuruSeries
 from .const import DOMAIN, WaterGuruEntityAttributes
+from .device import pod_device_info, water_body_device_info
 from .waterguru import WaterGuruDevice
+from .waterguru_device import WaterGuruMeasurement, WaterGuruPod
 
 STANDARD_SENSORS: dict[str, SensorEntityDescription] = {
     "temp": SensorEntityDescription(
@@ -71,9 +82,87 @@ STANDARD_SENSORS: dict[str, SensorEntityDescription] = {
     ),
 }
 
+# standard sensors that are reported per pod instead of per water body
+POD_SENSORS = {"battery", "cassette", "cassette_days_remaining", "rssi"}
+
+# how fast the pod levels go down, in percent per day
+DEPLETION_SENSORS: dict[str, SensorEntityDescription] = {
+    key: SensorEntityDescription(
+        key=f"{key}_depletion_rate",
+        name=f"{name} Depletion Rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=f"{PERCENTAGE}/d",
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:trending-down",
+    )
+    for key, name in (("battery", "Battery"), ("cassette", "Cassette"))
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class WaterGuruTrendSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor derived from the recent readings of a measurement."""
+
+    value_fn: Callable[[WaterGuruSeries, WaterGuruMeasurement], float | None]
+
+
+def _trend_descriptions(
+    measurement: WaterGuruMeasurement,
+) -> list[WaterGuruTrendSensorEntityDescription]:
+    """Return the trend sensors of a measurement."""
+    return [
+        WaterGuruTrendSensorEntityDescription(
+            key=f"{measurement.type}_mean",
+            name=f"{measurement.title} Average",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=measurement.unit,
+            suggested_display_precision=measurement.dec_places,
+            entity_registry_enabled_default=False,
+            icon="mdi:chart-bell-curve-cumulative",
+            value_fn=lambda series, m: series.mean,
+        ),
+        WaterGuruTrendSensorEntityDescription(
+            key=f"{measurement.type}_trend",
+            name=f"{measurement.title} Trend",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=f"{measurement.unit}/h" if measurement.unit else None,
+            suggested_display_precision=(measurement.dec_places or 0) + 2,
+            entity_registry_enabled_default=False,
+            icon="mdi:chart-line",
+            value_fn=lambda series, m: series.slope,
+        ),
+        WaterGuruTrendSensorEntityDescription(
+            key=f"{measurement.type}_time_to_threshold",
+            name=f"{measurement.title} Time to Threshold",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.HOURS,
+            suggested_display_precision=0,
+            entity_registry_enabled_default=False,
+            icon="mdi:timer-sand",
+            value_fn=lambda series, m: series.hours_until(m.ideal_min, m.ideal_max),
+        ),
+    ]
+
+
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class WaterGuruSensorState:
+    """State of a sensor, computed once per coordinator update."""
+
+    value: StateType | datetime = None
+    icon: str | None = None
+    attributes: dict[str, Any] | None = None
+    available: bool = True
+
+
+UNAVAILABLE = WaterGuruSensorState(available=False)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -82,79 +171,188 @@ async def async_setup_entry(
     """Set up the WaterGuru sensor."""
 
     coordinator: WaterGuruDataCoordinatorType = hass.data[DOMAIN][entry.entry_id]
-
-    entities: list[WaterGuruBaseSensor] = [
-        WaterGuruSensor(
-            coordinator,
-            waterguru_device,
-            STANDARD_SENSORS[sensor_types],
-            STANDARD_SENSORS[sensor_types].key,
+    known_unique_ids: set[str] = set()
+
+    _async_migrate_pod_unique_ids(hass, coordinator)
+
+    @callback
+    def _async_add_new_entities(device_ids: Iterable[str]) -> None:
+        """Add the entities that do not exist yet.
+
+        The unique ids follow from the payload, so only the missing sensors
+        are built.
+        """
+        entities = [
+            factory()
+            for device_id in device_ids
+            if device_id in coordinator.data
+            for unique_id, factory in _device_entity_factories(coordinator, coordinator.data[device_id])
+            if unique_id not in known_unique_ids
+        ]
+        known_unique_ids.update(entity.unique_id for entity in entities)
+        if entities:
+            async_add_entities(entities)
+
+    @callback
+    def _async_discover() -> None:
+        """Add entities for new water bodies and measurement types.
+
+        Only water bodies whose payload changed can have new entities; the
+        entities of anything that disappeared become unavailable.
+        """
+        _async_add_new_entities(coordinator.changed_device_ids)
+
+    _async_add_new_entities(list(coordinator.data))
+    entry.async_on_unload(coordinator.async_add_listener(_async_discover))
+
+
+def _device_entities(
+    coordinator: WaterGuruDataCoordinatorType,
+    waterguru_device: WaterGuruDevice,
+) -> list[WaterGuruBaseSensor]:
+    """Return all the sensors of a water body."""
+    return [factory() for _, factory in _device_entity_factories(coordinator, waterguru_device)]
+
+
+def _device_entity_factories(
+    coordinator: WaterGuruDataCoordinatorType,
+    waterguru_device: WaterGuruDevice,
+) -> list[tuple[str, Callable[[], WaterGuruBaseSensor]]]:
+    """Return the unique id of each sensor of a water body and how to build it."""
+
+    device_id = waterguru_device.device_id
+    factories: list[tuple[str, Callable[[], WaterGuruBaseSensor]]] = [
+        (
+            f"{device_id}_{STANDARD_SENSORS[sensor_types].key}",
+            partial(
+                WaterGuruSensor,
+                coordinator,
+                waterguru_device,
+                STANDARD_SENSORS[sensor_types],
+                STANDARD_SENSORS[sensor_types].key,
+            ),
         )
-        for waterguru_device in coordinator.data.values()
         for sensor_types in waterguru_device.sensors
         if sensor_types in STANDARD_SENSORS
     ]
 
-    for waterguru_device in coordinator.data.values():
-        for measurement in waterguru_device.measurements.values():
-            entities.append(
-                WaterGuruSensor(
-                    coordinator,
-                    waterguru_device,
-                    SensorEntityDescription(
-                        key=measurement["type"],
-                        translation_key=measurement["type"],
-                        name=measurement["title"],
-                        device_class=(
-                            SensorDeviceClass.PH if measurement["type"] == "PH" else None
-                        ),
-                        state_class=SensorStateClass.MEASUREMENT,
-                        native_unit_of_measurement=measurement["cfg"].get("unit"),
-                        suggested_display_precision=measurement["cfg"].get("decPlaces"),
-                    ),
-                    measurement["type"],
-                )
+    for pod in waterguru_device.pods.values():
+        factories.extend(
+            (
+                f"{pod.pod_id}_{STANDARD_SENSORS[sensor_types].key}",
+                partial(WaterGuruPodSensor, coordinator, waterguru_device, pod, STANDARD_SENSORS[sensor_types]),
             )
-
-            entities.append(
-                WaterGuruAlertSensor(
+            for sensor_types in pod.sensors
+            if sensor_types in STANDARD_SENSORS
+        )
+        factories.extend(
+            (
+                f"{pod.pod_id}_{DEPLETION_SENSORS[sensor_types].key}",
+                partial(
+                    WaterGuruDepletionSensor,
                     coordinator,
                     waterguru_device,
-                    SensorEntityDescription(
-                        key=measurement["type"] + "_alert",
-                        name=measurement["title"] + " Alert",
-                        entity_category=EntityCategory.DIAGNOSTIC,
-                    ),
-                    measurement["type"],
-                )
+                    pod,
+                    DEPLETION_SENSORS[sensor_types],
+                    sensor_types,
+                ),
             )
+            for sensor_types in pod.sensors
+            if sensor_types in DEPLETION_SENSORS
+        )
 
-        entities.append(
-            WaterGuruOverallStatusSensor(
-                coordinator,
-                waterguru_device,
-                SensorEntityDescription(
-                    key="status",
-                    translation_key="alert",
-                    name="Status",
-                    entity_category=EntityCategory.DIAGNOSTIC,
-                ),
+    for measurement in waterguru_device.measurements.values():
+        factories.append(
+            (
+                f"{device_id}_{measurement.type}",
+                partial(_measurement_sensor, coordinator, waterguru_device, measurement),
             )
         )
-        entities.append(
-            WaterGuruLastMeasurementSensor(
-                coordinator,
-                waterguru_device,
-                SensorEntityDescription(
-                    key="last_measurement",
-                    name="Last Measurement",
-                    entity_category=EntityCategory.DIAGNOSTIC,
-                    device_class=SensorDeviceClass.TIMESTAMP,
-                ),
+        factories.append(
+            (
+                f"{device_id}_{measurement.type}_alert",
+                partial(_alert_sensor, coordinator, waterguru_device, measurement),
             )
         )
+        factories.extend(
+            (
+                f"{device_id}_{description.key}",
+                partial(WaterGuruTrendSensor, coordinator, waterguru_device, description, measurement.type),
+            )
+            for description in _trend_descriptions(measurement)
+        )
+
+    factories.extend(
+        (
+            f"{device_id}_{description.key}",
+            partial(sensor_class, coordinator, waterguru_device, description),
+        )
+        for sensor_class, description in DEVICE_SENSORS
+    )
+
+    return factories
+
+
+def _measurement_sensor(
+    coordinator: WaterGuruDataCoordinatorType,
+    waterguru_device: WaterGuruDevice,
+    measurement: WaterGuruMeasurement,
+) -> WaterGuruSensor:
+    """Return the sensor of a measurement."""
+    return WaterGuruSensor(
+        coordinator,
+        waterguru_device,
+        SensorEntityDescription(
+            key=measurement.type,
+            translation_key=measurement.type,
+            name=measurement.title,
+            device_class=(
+                SensorDeviceClass.PH if measurement.type == "PH" else None
+            ),
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=measurement.unit,
+            suggested_display_precision=measurement.dec_places,
+        ),
+        measurement.type,
+    )
+
+
+def _alert_sensor(
+    coordinator: WaterGuruDataCoordinatorType,
+    waterguru_device: WaterGuruDevice,
+    measurement: WaterGuruMeasurement,
+) -> WaterGuruAlertSensor:
+    """Return the alert sensor of a measurement."""
+    return WaterGuruAlertSensor(
+        coordinator,
+        waterguru_device,
+        SensorEntityDescription(
+            key=measurement.type + "_alert",
+            name=measurement.title + " Alert",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+        measurement.type,
+    )
 
-    async_add_entities(entities)
+
+@callback
+def _async_migrate_pod_unique_ids(hass: HomeAssistant, coordinator: WaterGuruDataCoordinatorType) -> None:
+    """Move the pod sensors of the first pod from the water body to the pod.
+
+    They used to be keyed by the water body, they are now keyed by podId.
+    """
+    ent_reg = er.async_get(hass)
+    for waterguru_device in coordinator.data.values():
+        if (pod := next(iter(waterguru_device.pods.values()), None)) is None:
+            continue
+        for key in POD_SENSORS:
+            old_unique_id = f"{waterguru_device.device_id}_{key}"
+            new_unique_id = f"{pod.pod_id}_{key}"
+            if (entity_id := ent_reg.async_get_entity_id(Platform.SENSOR, DOMAIN, old_unique_id)) is None:
+                continue
+            if ent_reg.async_get_entity_id(Platform.SENSOR, DOMAIN, new_unique_id) is not None:
+                continue
+            ent_reg.async_update_entity(entity_id, new_unique_id=new_unique_id)
 
 
 class WaterGuruBaseSensor(
@@ -170,9 +368,17 @@ class WaterGuruBaseSensor(
             WaterGuruEntityAttributes.DESC,
             WaterGuruEntityAttributes.STATUS_COLOR,
             WaterGuruEntityAttributes.ADVICE,
+            WaterGuruEntityAttributes.MEASUREMENT_INTERVAL,
+            WaterGuruEntityAttributes.PHASES,
+            WaterGuruEntityAttributes.COUNTERS,
         }
     )
 
+    # write the state after every refresh, even if the device data did not change
+    _update_on_every_refresh = False
+    # skip numeric changes within the deadband configured in the options
+    _significant_change_filter = False
+
     def __init__(
         self,
         coordinator: WaterGuruDataCoordinatorType,
@@ -184,6 +390,7 @@ class WaterGuruBaseSensor(
         super().__init__(coordinator)
 
         self._waterguru_key = waterguru_key
+        self._last_update_success = coordinator.last_update_success
 
         self.entity_description = entity_description
 
@@ -193,140 +400,277 @@ class WaterGuruBaseSensor(
             else:
                 self._attr_icon = "mdi:test-tube"
 
-        self._attr_unique_id = f"{waterguru_device.device_id}_{entity_description.key}"
         self._id = waterguru_device.device_id
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, waterguru_device.device_id)},
-            name=waterguru_device.name,
-            manufacturer="WaterGuru",
-            model=waterguru_device.product_name,
-            suggested_area="Pool",
-            serial_number=waterguru_device.serial_number,
-            sw_version=waterguru_device.firmware_version,
-        )
+        self._last_write = dt_util.utcnow()
+        self._attr_unique_id = f"{waterguru_device.device_id}_{entity_description.key}"
+        self._attr_device_info = water_body_device_info(waterguru_device)
+        self._state = self._project(waterguru_device)
 
-class WaterGuruSensor(WaterGuruBaseSensor):
-    """Representation of a WaterGuru sensor."""
+    @property
+    def available(self) -> bool:
+        """Return if the entity is available."""
+        return super().available and self._state.available
 
     @property
-    def extra_state_attributes(self) -> dict[str, str] | None:
+    def native_value(self) -> StateType | datetime:
+        """Return the value reported by the sensor."""
+        return self._state.value
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon to use in the frontend."""
+        return self._state.icon or super().icon
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return entity specific state attributes."""
+        return self._state.attributes
+
+    @abstractmethod
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the device data."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the device data or availability changed."""
+
+        availability_changed = self.coordinator.last_update_success != self._last_update_success
+        if (
+            not self._update_on_every_refresh
+            and not availability_changed
+            and self._id not in self.coordinator.changed_device_ids
+        ):
+            return
+        self._last_update_success = self.coordinator.last_update_success
+        state = self._project(self.coordinator.data.get(self._id))
+        now = dt_util.utcnow()
+        # failed updates and the recovery after them are always written
+        if self._significant_change_filter and not availability_changed and not self._is_significant(state, now):
+            return
+        self._state = state
+        self._last_write = now
+        super()._handle_coordinator_update()
+
+    def _is_significant(self, state: WaterGuruSensorState, now: datetime) -> bool:
+        """Return True unless a numeric value moved less than the deadband.
+
+        The deadband is a number of steps of the display precision, taken
+        from the decPlaces of the measurement. The attributes are written
+        with the next significant value.
+        """
+        if (steps := self.coordinator.config.deadband_steps) <= 0:
+            return True
+        if state.available != self._state.available or now - self._last_write >= self.coordinator.config.max_silence:
+            return True
+        old, new = self._state.value, state.value
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+            return old != new
+        deadband = steps * 10 ** -(self.entity_description.suggested_display_precision or 0)
+        return abs(new - old) >= deadband
+
+class WaterGuruSensor(WaterGuruBaseSensor):
+    """Representation of a WaterGuru sensor."""
+
+    _significant_change_filter = True
+
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the device data."""
+
+        if device is None:
+            return UNAVAILABLE
 
         if self._waterguru_key in STANDARD_SENSORS:
-            return None
+            if self._waterguru_key not in device.sensors:
+                return UNAVAILABLE
+            return WaterGuruSensorState(value=device.sensors[self._waterguru_key])
+
+        if self._waterguru_key not in device.measurements:
+            return UNAVAILABLE
 
-        # Check if the measurement exists before accessing it
-        if (self._id not in self.coordinator.data or
-            self._waterguru_key not in self.coordinator.data[self._id].measurements):
-            return None
+        m = device.measurements[self._waterguru_key]
+        return WaterGuruSensorState(value=m.value, attributes=self._measurement_attributes(m))
 
-        m = self.coordinator.data[self._id].measurements[self._waterguru_key]
+    @staticmethod
+    def _measurement_attributes(m: WaterGuruMeasurement) -> dict[str, Any]:
+        """Return the state attributes of a measurement."""
 
         a = {
-            WaterGuruEntityAttributes.LAST_MEASUREMENT: m.get("measureTime"),
-            WaterGuruEntityAttributes.DESC: m.get("cfg", {}).get("desc"),
-            WaterGuruEntityAttributes.STATUS_COLOR: m.get("status"),
+            WaterGuruEntityAttributes.LAST_MEASUREMENT: m.measure_time,
+            WaterGuruEntityAttributes.DESC: m.desc,
+            WaterGuruEntityAttributes.STATUS_COLOR: m.status,
         }
 
-        alerts = m.get("alerts")
-        if alerts:
-            advice = alerts[0].get("advice", {}).get("action", {}).get("summary")
-            if advice is not None:
-                a[WaterGuruEntityAttributes.ADVICE] = advice
+        if m.advice is not None:
+            a[WaterGuruEntityAttributes.ADVICE] = m.advice
 
         return a
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the value reported by the sensor."""
+class WaterGuruPodSensor(WaterGuruBaseSensor):
+    """Representation of a WaterGuru sensor that belongs to a pod."""
 
-        if self._waterguru_key in STANDARD_SENSORS:
-            # Check if the sensor data exists
-            if (self._id not in self.coordinator.data or
-                self._waterguru_key not in self.coordinator.data[self._id].sensors):
-                return None
-            return self.coordinator.data[self._id].sensors[self._waterguru_key]
+    _significant_change_filter = True
 
-        # Check if the measurement exists before accessing it
-        if (self._id not in self.coordinator.data or
-            self._waterguru_key not in self.coordinator.data[self._id].measurements):
-            return None
+    def __init__(
+        self,
+        coordinator: WaterGuruDataCoordinatorType,
+        waterguru_device: WaterGuruDevice,
+        pod: WaterGuruPod,
+        entity_description: SensorEntityDescription,
+        waterguru_key: str | None = None,
+    ) -> None:
+        """Initialize the sensor."""
+        self._pod_id = pod.pod_id
+        super().__init__(coordinator, waterguru_device, entity_description, waterguru_key or entity_description.key)
 
-        m = self.coordinator.data[self._id].measurements[self._waterguru_key]
+        self._attr_unique_id = f"{pod.pod_id}_{entity_description.key}"
+        self._attr_device_info = pod_device_info(waterguru_device, pod)
 
-        if m.get("floatValue") is None:
-            return m.get("intValue")
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the pod data."""
 
-        return m.get("floatValue")
+        if device is None or (pod := device.pods.get(self._pod_id)) is None:
+            return UNAVAILABLE
+        if self._waterguru_key not in pod.sensors:
+            return UNAVAILABLE
+        return WaterGuruSensorState(value=pod.sensors[self._waterguru_key])
 
-class WaterGuruOverallStatusSensor(WaterGuruBaseSensor):
-    """Representation of a WaterGuru Sensor that shows the overall pool status."""
+class WaterGuruDepletionSensor(WaterGuruPodSensor):
+    """Representation of a WaterGuru sensor that shows how fast a pod level goes down."""
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the value reported by the sensor."""
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the recent pod levels."""
 
-        # Check if the device data exists
-        if self._id not in self.coordinator.data:
-            return None
+        if device is None or self._pod_id not in device.pods:
+            return UNAVAILABLE
+        series = self.coordinator.analytics.series(self._pod_id, self._waterguru_key)
+        if series is None or (slope := series.slope) is None:
+            return WaterGuruSensorState()
+        return WaterGuruSensorState(value=round(-slope * 24, 4))
 
-        return self.coordinator.data[self._id].status
+class WaterGuruTrendSensor(WaterGuruBaseSensor):
+    """Representation of a WaterGuru sensor derived from the recent readings of a measurement."""
 
-    @property
-    def icon(self) -> str:
-        """Return the icon to use in the frontend."""
+    entity_description: WaterGuruTrendSensorEntityDescription
 
-        # Check if the device data exists
-        if self._id not in self.coordinator.data:
-            return "mdi:alert-outline"
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the recent readings."""
 
-        if self.coordinator.data[self._id].status == "GREEN":
-            return "mdi:alert-circle-check-outline"
-        return "mdi:alert-outline"
+        if device is None or self._waterguru_key not in device.measurements:
+            return UNAVAILABLE
+        series = self.coordinator.analytics.series(self._id, self._waterguru_key)
+        if series is None:
+            return WaterGuruSensorState()
+        value = self.entity_description.value_fn(series, device.measurements[self._waterguru_key])
+        return WaterGuruSensorState(value=round(value, 4) if value is not None else None)
 
-class WaterGuruAlertSensor(WaterGuruSensor):
-    """Representation of a WaterGuru Sensor that shows the alert status."""
+class WaterGuruOverallStatusSensor(WaterGuruBaseSensor):
+    """Representation of a WaterGuru Sensor that shows the overall pool status."""
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the value reported by the sensor."""
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the device data."""
 
-        # Check if the measurement exists before accessing it
-        if (self._id not in self.coordinator.data or
-            self._waterguru_key not in self.coordinator.data[self._id].measurements):
-            return None
+        if device is None:
+            return WaterGuruSensorState(icon="mdi:alert-outline", available=False)
 
-        m = self.coordinator.data[self._id].measurements[self._waterguru_key]
-        if m.get("status") == "GREEN":
-            return "Ok"
-        return m.get("firstAlertCondition")
+        return WaterGuruSensorState(
+            value=device.status,
+            icon="mdi:alert-circle-check-outline" if device.status == "GREEN" else "mdi:alert-outline",
+        )
 
-    @property
-    def icon(self) -> str:
-        """Return the icon to use in the frontend."""
+class WaterGuruAlertSensor(WaterGuruSensor):
+    """Representation of a WaterGuru Sensor that shows the alert status."""
 
-        # Check if the measurement exists before accessing it
-        if (self._id not in self.coordinator.data or
-            self._waterguru_key not in self.coordinator.data[self._id].measurements):
-            return "mdi:alert-outline"
+    _significant_change_filter = False
 
-        m = self.coordinator.data[self._id].measurements[self._waterguru_key]
-        if m.get("status") == "GREEN":
-            return "mdi:alert-circle-check-outline"
-        return "mdi:alert-outline"
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the device data."""
+
+        if device is None or self._waterguru_key not in device.measurements:
+            return WaterGuruSensorState(icon="mdi:alert-outline", available=False)
+
+        m = device.measurements[self._waterguru_key]
+        if m.status == "GREEN":
+            return WaterGuruSensorState(
+                value="Ok",
+                icon="mdi:alert-circle-check-outline",
+                attributes=self._measurement_attributes(m),
+            )
+        return WaterGuruSensorState(
+            value=m.alert_condition,
+            icon="mdi:alert-outline",
+            attributes=self._measurement_attributes(m),
+        )
 
 class WaterGuruLastMeasurementSensor(WaterGuruBaseSensor):
     """Representation of a WaterGuru Sensor that shows the last time the water was tested."""
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the value reported by the sensor."""
+    # also reports whether the data is stale, which can change without new device data
+    _update_on_every_refresh = True
+
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the device data."""
+
+        if device is None:
+            return UNAVAILABLE
+
+        strTs = device.last_measurement_time
+        a: dict[str, Any] = {WaterGuruEntityAttributes.STALE: self.coordinator.stale}
+        if (cadence := self.coordinator.scheduler.cadence(self._id)) is not None:
+            # the learned time between measurements in minutes
+            a[WaterGuruEntityAttributes.MEASUREMENT_INTERVAL] = round(cadence.total_seconds() / 60, 1)
+        return WaterGuruSensorState(
+            value=dt_util.parse_datetime(strTs) if strTs is not None else None,
+            attributes=a,
+        )
+
+class WaterGuruPollDurationSensor(WaterGuruBaseSensor):
+    """Representation of a WaterGuru Sensor that shows how long the last poll took."""
+
+    _update_on_every_refresh = True
 
-        # Check if the device data exists
-        if self._id not in self.coordinator.data:
-            return None
+    def _project(self, device: WaterGuruDevice | None) -> WaterGuruSensorState:
+        """Compute the state of the sensor from the API metrics."""
 
-        strTs = self.coordinator.data[self._id].last_measurement_time
-        if strTs is None:
-            return None
-        return dt_util.parse_datetime(strTs)
+        metrics = self.coordinator.api.metrics.as_dict()
+        phases = metrics["last_poll_ms"]
+        return WaterGuruSensorState(
+            value=phases.get("total"),
+            attributes={
+                WaterGuruEntityAttributes.PHASES: phases,
+                WaterGuruEntityAttributes.COUNTERS: metrics["counters"],
+            },
+        )
+
+# sensors every water body has, whatever its payload contains
+DEVICE_SENSORS: tuple[tuple[type[WaterGuruBaseSensor], SensorEntityDescription], ...] = (
+    (
+        WaterGuruOverallStatusSensor,
+        SensorEntityDescription(
+            key="status",
+            translation_key="alert",
+            name="Status",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    (
+        WaterGuruLastMeasurementSensor,
+        SensorEntityDescription(
+            key="last_measurement",
+            name="Last Measurement",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            device_class=SensorDeviceClass.TIMESTAMP,
+        ),
+    ),
+    (
+        WaterGuruPollDurationSensor,
+        SensorEntityDescription(
+            key="poll_duration",
+            name="Poll Duration",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            entity_registry_enabled_default=False,
+        ),
+    ),
+)
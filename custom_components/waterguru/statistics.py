@@ -0,0 +1,111 @@
+"""Long-term statistics import for WaterGuru measurements."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .waterguru_device import WaterGuruDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+def statistic_id(device_id: str, measurement_type: str) -> str:
+    """Return the external statistic id of a measurement."""
+    return f"{DOMAIN}:{slugify(f'{device_id}_{measurement_type}')}"
+
+
+class WaterGuruStatisticsImporter:
+    """Import the measurements of an account as external long-term statistics.
+
+    Every reading is added to an hourly bucket keyed by its own measureTime,
+    not by the time it was polled. The recorder gets one bulk insert per
+    statistic instead of a state row per reading. A high-water mark per
+    statistic makes sure each reading is only counted once, also across
+    restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics"
+        )
+        # statistic id -> high-water mark and the aggregates of its latest hour
+        self._buckets: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the high-water marks."""
+        self._buckets = await self._store.async_load() or {}
+
+    async def async_remove(self) -> None:
+        """Remove the stored high-water marks."""
+        await self._store.async_remove()
+
+    @callback
+    def async_import(self, devices: dict[str, WaterGuruDevice]) -> None:
+        """Import the new readings of the given devices."""
+        pending: list[tuple[StatisticMetaData, StatisticData]] = []
+        for device in devices.values():
+            for measurement in device.measurements.values():
+                if not isinstance(measurement.value, (int, float)) or measurement.measure_time is None:
+                    continue
+                if (measured := dt_util.parse_datetime(measurement.measure_time)) is None:
+                    continue
+
+                stat_id = statistic_id(device.device_id, measurement.type)
+                if (row := self._add_reading(stat_id, measured, float(measurement.value))) is None:
+                    continue
+                pending.append(
+                    (
+                        StatisticMetaData(
+                            has_mean=True,
+                            has_sum=False,
+                            name=f"{device.name} {measurement.title}",
+                            source=DOMAIN,
+                            statistic_id=stat_id,
+                            unit_of_measurement=measurement.unit,
+                        ),
+                        row,
+                    )
+                )
+
+        for metadata, row in pending:
+            async_add_external_statistics(self.hass, metadata, [row])
+        if pending:
+            _LOGGER.debug("Imported %s WaterGuru readings into statistics", len(pending))
+            self._store.async_delay_save(lambda: self._buckets, SAVE_DELAY)
+
+    def _add_reading(self, stat_id: str, measured: datetime, value: float) -> StatisticData | None:
+        """Add a reading to its hourly bucket, return the updated row if it was new."""
+        bucket = self._buckets.get(stat_id)
+        if bucket is not None and measured <= datetime.fromisoformat(bucket["last"]):
+            return None
+
+        start = dt_util.as_utc(measured).replace(minute=0, second=0, microsecond=0)
+        if bucket is None or bucket["start"] != start.isoformat():
+            bucket = {"start": start.isoformat(), "count": 0, "sum": 0.0, "min": value, "max": value}
+            self._buckets[stat_id] = bucket
+
+        bucket["last"] = measured.isoformat()
+        bucket["count"] += 1
+        bucket["sum"] += value
+        bucket["min"] = min(bucket["min"], value)
+        bucket["max"] = max(bucket["max"], value)
+        return StatisticData(
+            start=start,
+            mean=bucket["sum"] / bucket["count"],
+            min=bucket["min"],
+            max=bucket["max"],
+        )
@@ -1,82 +1,665 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
+import json
 import logging
+import time
+from typing import Any
+from urllib.parse import quote, urlsplit
 
-from aiohttp import ClientSession
-import boto3
-import botocore
-import requests
-from requests_aws4auth import AWS4Auth
-from warrant import Cognito
-from warrant.aws_srp import AWSSRP
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from multidict import CIMultiDictProxy
+import voluptuous as vol
 
+from .parser import json_loads, parse_water_bodies
 from .waterguru_device import WaterGuruDevice
 
 _LOGGER = logging.getLogger(__name__)
 
+REGION_NAME = "us-west-2"
+POOL_ID = "us-west-2_icsnuWQWw"
+IDENTITY_POOL_ID = "us-west-2:691e3287-5776-40f2-a502-759de65a8f1c"
+CLIENT_ID = "7pk5du7fitqb419oabb3r92lni"
+
+COGNITO_IDP_URL = "https://cognito-idp.us-west-2.amazonaws.com/"
+COGNITO_IDENTITY_URL = "https://cognito-identity.us-west-2.amazonaws.com/"
+DASHBOARD_URL = "https://lambda.us-west-2.amazonaws.com/2015-03-31/functions/prod-getDashboardView/invocations"
+
+REQUEST_TIMEOUT = 9.9
+# keep idle connections to the AWS endpoints open between back-to-back calls
+KEEPALIVE_TIMEOUT = 60
+
+PASSWORD_VERIFIER_CHALLENGE = "PASSWORD_VERIFIER"
+
+# refresh tokens and credentials this long before they actually expire
+EXPIRY_MARGIN = timedelta(minutes=5)
+
+# Cognito error types that mean the username or password is wrong, or that
+# the tokens were revoked or expired when they come from a call that uses them
+AUTH_ERRORS = {"NotAuthorizedException", "UserNotFoundException", "PasswordResetRequiredException"}
+# AWS error types that mean we are calling too often
+THROTTLING_ERRORS = {"TooManyRequestsException", "ThrottlingException", "LimitExceededException"}
+
+# the parts of the AWS responses the client reads
+SECONDS = vol.All(vol.Any(int, float), vol.Range(min=0, max=2**32))
+AUTHENTICATION_RESULT_SCHEMA = vol.Schema(
+    {
+        vol.Required("IdToken"): str,
+        vol.Required("AccessToken"): str,
+        vol.Required("ExpiresIn"): SECONDS,
+        vol.Optional("RefreshToken"): str,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+REFRESH_RESPONSE_SCHEMA = vol.Schema(
+    {vol.Required("AuthenticationResult"): AUTHENTICATION_RESULT_SCHEMA}, extra=vol.ALLOW_EXTRA
+)
+SRP_CHALLENGE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("ChallengeName"): vol.Any(str, None),
+        vol.Optional("ChallengeParameters"): vol.Schema(
+            {
+                vol.Required("SALT"): str,
+                vol.Required("SRP_B"): str,
+                vol.Required("SECRET_BLOCK"): str,
+                vol.Required("USER_ID_FOR_SRP"): str,
+            },
+            extra=vol.ALLOW_EXTRA,
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+CHALLENGE_RESPONSE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("ChallengeName"): vol.Any(str, None),
+        vol.Optional("AuthenticationResult"): AUTHENTICATION_RESULT_SCHEMA,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+GET_USER_SCHEMA = vol.Schema({vol.Required("Username"): str}, extra=vol.ALLOW_EXTRA)
+GET_ID_SCHEMA = vol.Schema({vol.Required("IdentityId"): str}, extra=vol.ALLOW_EXTRA)
+CREDENTIALS_SCHEMA = vol.Schema(
+    {
+        vol.Required("Credentials"): vol.Schema(
+            {
+                vol.Required("AccessKeyId"): str,
+                vol.Required("SecretKey"): str,
+                vol.Required("SessionToken"): str,
+                # seconds since the epoch
+                vol.Required("Expiration"): SECONDS,
+            },
+            extra=vol.ALLOW_EXTRA,
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 class WaterGuruApiError(Exception):
     """Raised when an error occurs while accessing the WaterGuru API."""
 
+class WaterGuruAuthError(WaterGuruApiError):
+    """Raised when WaterGuru rejects the username or password."""
+
+class WaterGuruThrottledError(WaterGuruApiError):
+    """Raised when AWS throttles the requests."""
+
+@dataclass
+class WaterGuruAuthCache:
+    """Cognito tokens and temporary AWS credentials kept between polls."""
+
+    id_token: str | None = None
+    access_token: str | None = None
+    refresh_token: str | None = None
+    token_expiration: datetime | None = None
+    user_id: str | None = None
+    identity_id: str | None = None
+    access_key_id: str | None = None
+    secret_key: str | None = None
+    session_token: str | None = None
+    credentials_expiration: datetime | None = None
+
+    def tokens_valid(self, margin: timedelta = EXPIRY_MARGIN) -> bool:
+        """Return True if the Cognito tokens can still be used."""
+        return self.id_token is not None and _not_expiring(self.token_expiration, margin)
+
+    def credentials_valid(self, margin: timedelta = EXPIRY_MARGIN) -> bool:
+        """Return True if the temporary AWS credentials can still be used."""
+        return self.access_key_id is not None and _not_expiring(self.credentials_expiration, margin)
+
+    def invalidate_tokens(self) -> None:
+        """Forget the Cognito tokens, the refresh token is kept to renew them."""
+        self.id_token = None
+        self.access_token = None
+        self.token_expiration = None
+
+    def invalidate_credentials(self) -> None:
+        """Forget the temporary AWS credentials."""
+        self.access_key_id = None
+        self.secret_key = None
+        self.session_token = None
+        self.credentials_expiration = None
+
+@dataclass(frozen=True, slots=True)
+class WaterGuruEndpoints:
+    """URLs of the AWS services the client talks to.
+
+    Can be pointed at a local stand-in for the AWS backend.
+    """
+
+    cognito_idp: str = COGNITO_IDP_URL
+    cognito_identity: str = COGNITO_IDENTITY_URL
+    dashboard: str = DASHBOARD_URL
+
+    @classmethod
+    def for_region(cls, region: str) -> WaterGuruEndpoints:
+        """Return the endpoints of an AWS region."""
+        return cls(
+            cognito_idp=f"https://cognito-idp.{region}.amazonaws.com/",
+            cognito_identity=f"https://cognito-identity.{region}.amazonaws.com/",
+            dashboard=f"https://lambda.{region}.amazonaws.com/2015-03-31/functions/prod-getDashboardView/invocations",
+        )
+
+@dataclass(frozen=True, slots=True)
+class WaterGuruApiConfig:
+    """Settings of the client that can be changed per account."""
+
+    region: str = REGION_NAME
+    pool_id: str = POOL_ID
+    identity_pool_id: str = IDENTITY_POOL_ID
+    client_id: str = CLIENT_ID
+    # seconds
+    request_timeout: float = REQUEST_TIMEOUT
+    expiry_margin: timedelta = EXPIRY_MARGIN
+
+    @property
+    def idp_pool(self) -> str:
+        """Return the Cognito login provider name of the user pool."""
+        return f"cognito-idp.{self.region}.amazonaws.com/{self.pool_id}"
+
+    def same_account_pool(self, other: WaterGuruApiConfig) -> bool:
+        """Return True if tokens issued for one config are valid for the other."""
+        return (self.region, self.pool_id, self.identity_pool_id, self.client_id) == (
+            other.region,
+            other.pool_id,
+            other.identity_pool_id,
+            other.client_id,
+        )
+
+class WaterGuruMetrics:
+    """Per-phase timings of the last poll and counters since startup."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.last_poll: dict[str, float] = {}
+        self.counters: Counter[str] = Counter()
+
+    def start_poll(self) -> None:
+        """Forget the timings of the previous poll."""
+        self.last_poll = {}
+        self.counters["polls"] += 1
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Add the time spent in the block to a phase of the current poll."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.last_poll[phase] = self.last_poll.get(phase, 0.0) + time.perf_counter() - start
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics with timings in milliseconds."""
+        return {
+            "last_poll_ms": {phase: round(seconds * 1000, 1) for phase, seconds in self.last_poll.items()},
+            "counters": dict(self.counters),
+        }
+
+def _not_expiring(expiration: datetime | None, margin: timedelta) -> bool:
+    """Return True if expiration is far enough in the future."""
+    return expiration is not None and datetime.now(timezone.utc) + margin < expiration
+
+def _hmac_sha256(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+def _sign_request(
+    url: str,
+    body: bytes,
+    headers: dict[str, str],
+    access_key_id: str,
+    secret_key: str,
+    session_token: str,
+    region: str,
+    service: str,
+) -> dict[str, str]:
+    """Return headers with an AWS Signature Version 4 for a POST request."""
+    now = datetime.now(timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date_stamp = now.strftime("%Y%m%d")
+    parts = urlsplit(url)
+
+    # like botocore, leave headers that proxies may rewrite (e.g. User-Agent) unsigned
+    signed = {k.lower(): v.strip() for k, v in headers.items() if k.lower() == "content-type"}
+    signed["host"] = parts.netloc
+    signed["x-amz-date"] = amz_date
+    signed["x-amz-security-token"] = session_token
+    signed_headers = ";".join(sorted(signed))
+
+    canonical_request = "\n".join(
+        [
+            "POST",
+            quote(parts.path or "/", safe="/-_.~"),
+            parts.query,
+            "".join(f"{k}:{signed[k]}\n" for k in sorted(signed)),
+            signed_headers,
+            hashlib.sha256(body).hexdigest(),
+        ]
+    )
+    scope = f"{date_stamp}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join(
+        [
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ]
+    )
+
+    key = ("AWS4" + secret_key).encode("utf-8")
+    for part in (date_stamp, region, service, "aws4_request"):
+        key = _hmac_sha256(key, part)
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    return {
+        **headers,
+        "X-Amz-Date": amz_date,
+        "X-Amz-Security-Token": session_token,
+        "Authorization": (
+            f"AWS4-HMAC-SHA256 Credential={access_key_id}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        ),
+    }
+
+class _UnusedCognitoClient:
+    """Stands in for the boto3 client pycognito's AWSSRP requires but we never call."""
+
+    def __getattr__(self, name: str) -> Any:
+        raise AttributeError(f"Cognito calls are made with aiohttp, not {name}")
+
 class WaterGuru:
     """WaterGuru API wrapper."""
 
-    def __init__(self, username: str, password: str, session: ClientSession):
-        """Initialize the API wrapper."""
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        session: ClientSession | None = None,
+        endpoints: WaterGuruEndpoints | None = None,
+        config: WaterGuruApiConfig | None = None,
+    ):
+        """Initialize the API wrapper.
+
+        All requests go through one pooled, keep-alive session: the one passed
+        in (Home Assistant's shared session) or, without one, a session owned
+        by this instance and closed by async_close.
+        """
         self._username = username
         self._password = password
         self._session = session
+        self._own_session: ClientSession | None = None
+        self.config = config or WaterGuruApiConfig()
+        # explicit endpoints win over the ones of the configured region
+        self._endpoints_override = endpoints
+        self._endpoints = endpoints or self._region_endpoints(self.config)
+        self._timeout = ClientTimeout(total=self.config.request_timeout)
+        self.metrics = WaterGuruMetrics()
+        self._auth = WaterGuruAuthCache()
+
+    def _create_srp(self):
+        """Create the pycognito SRP helper.
+
+        pycognito takes hundreds of milliseconds to import, so it is only
+        loaded here, in the executor, the first time a full login is needed.
+        Only its SRP math is used, the Cognito calls go through aiohttp, so
+        it gets a placeholder instead of a boto3 client and no botocore
+        service model is ever loaded.
+        """
+        from pycognito.aws_srp import AWSSRP
+
+        return AWSSRP(
+            username=self._username,
+            password=self._password,
+            pool_id=self.config.pool_id,
+            client_id=self.config.client_id,
+            client=_UnusedCognitoClient(),
+        )
 
-    def get(self):
+    @staticmethod
+    def _region_endpoints(config: WaterGuruApiConfig) -> WaterGuruEndpoints:
+        """Return the endpoints of the configured region."""
+        if config.region == REGION_NAME:
+            return WaterGuruEndpoints()
+        return WaterGuruEndpoints.for_region(config.region)
+
+    def set_config(self, config: WaterGuruApiConfig) -> None:
+        """Apply new settings, starting with the next request.
+
+        Tokens and credentials are dropped when they were issued for
+        another region, pool or client.
+        """
+        if not self.config.same_account_pool(config):
+            self._auth = WaterGuruAuthCache()
+        self.config = config
+        self._endpoints = self._endpoints_override or self._region_endpoints(config)
+        self._timeout = ClientTimeout(total=config.request_timeout)
+
+    async def async_close(self) -> None:
+        """Release the resources held by the API wrapper."""
+        if self._own_session is not None:
+            await self._own_session.close()
+            self._own_session = None
+
+    def _get_session(self) -> ClientSession:
+        """Return the pooled session used for every request."""
+        if self._session is not None:
+            return self._session
+        if self._own_session is None:
+            self._own_session = ClientSession(connector=TCPConnector(keepalive_timeout=KEEPALIVE_TIMEOUT))
+        return self._own_session
+
+    async def _async_post(self, url: str, body: bytes, headers: dict[str, str]) -> tuple[int, CIMultiDictProxy[str], bytes]:
+        """POST a request and return the status, headers and body.
+
+        The body is always read in full, even for errors, so the connection
+        goes back to the pool instead of being closed.
+        """
+        self.metrics.counters["aws_requests"] += 1
+        async with self._get_session().post(url, data=body, headers=headers, timeout=self._timeout) as response:
+            return response.status, response.headers, await response.read()
+
+    async def _async_aws_json(
+        self, url: str, target: str, payload: dict[str, Any], schema: vol.Schema
+    ) -> dict[str, Any]:
+        """Call an unsigned AWS JSON API (Cognito) and return the decoded response.
+
+        A successful response that does not match the schema raises
+        WaterGuruApiError, like any other failed call.
+        """
+        headers = {"Content-Type": "application/x-amz-json-1.1", "X-Amz-Target": target}
+        try:
+            status, _, raw = await self._async_post(url, json.dumps(payload).encode("utf-8"), headers)
+            data = json.loads(raw)
+        except (ClientError, TimeoutError) as e:
+            raise WaterGuruApiError(f"Error while calling {target}: {e!r}") from e
+        except ValueError as e:
+            raise WaterGuruApiError(f"Invalid response from {target}") from e
+
+        if status >= 400 or not isinstance(data, dict):
+            error = str(data.get("__type", status)) if isinstance(data, dict) else str(status)
+            message = data.get("message") if isinstance(data, dict) else None
+            # the type may be qualified, e.g. "com.amazon...#NotAuthorizedException"
+            error = error.rpartition("#")[2]
+            if error in AUTH_ERRORS:
+                raise WaterGuruAuthError(f"{target} failed: {error} {message or ''}".strip())
+            if error in THROTTLING_ERRORS or status == 429:
+                raise WaterGuruThrottledError(f"{target} failed: {error} {message or ''}".strip())
+            raise WaterGuruApiError(f"{target} failed: {error} {message or ''}".strip())
+        try:
+            return schema(data)
+        except vol.Invalid as e:
+            raise WaterGuruApiError(f"Unexpected response from {target}: {e}") from e
+
+    def _store_tokens(self, result: dict[str, Any]) -> None:
+        """Store the tokens from a Cognito AuthenticationResult."""
+        self._auth.id_token = result['IdToken']
+        self._auth.access_token = result['AccessToken']
+        # the refresh flow does not return a new refresh token
+        self._auth.refresh_token = result.get('RefreshToken', self._auth.refresh_token)
+        self._auth.token_expiration = datetime.now(timezone.utc) + timedelta(seconds=result['ExpiresIn'])
+
+    async def _async_refresh_tokens(self) -> bool:
+        """Renew the Cognito tokens with the refresh token."""
+        if self._auth.refresh_token is None:
+            return False
+
+        try:
+            with self.metrics.timed("token_refresh"):
+                response = await self._async_aws_json(
+                    self._endpoints.cognito_idp,
+                    "AWSCognitoIdentityProviderService.InitiateAuth",
+                    {
+                        "AuthFlow": "REFRESH_TOKEN_AUTH",
+                        "AuthParameters": {"REFRESH_TOKEN": self._auth.refresh_token},
+                        "ClientId": self.config.client_id,
+                    },
+                    REFRESH_RESPONSE_SCHEMA,
+                )
+        except WaterGuruAuthError as e:
+            _LOGGER.debug("Unable to refresh WaterGuru tokens, logging in again: %s", e)
+            self._auth.refresh_token = None
+            self.metrics.counters["token_refresh_failures"] += 1
+            return False
+
+        self._store_tokens(response['AuthenticationResult'])
+        self.metrics.counters["token_refreshes"] += 1
+        return True
+
+    async def _async_srp_login(self) -> None:
+        """Log in with the Cognito SRP flow."""
+        loop = asyncio.get_running_loop()
+        # only the SRP math is done by pycognito; its big-number work stays off the event loop
+        aws = await loop.run_in_executor(None, self._create_srp)
+
+        auth_params = aws.get_auth_params()
+        challenge = await self._async_aws_json(
+            self._endpoints.cognito_idp,
+            "AWSCognitoIdentityProviderService.InitiateAuth",
+            {"AuthFlow": "USER_SRP_AUTH", "AuthParameters": auth_params, "ClientId": self.config.client_id},
+            SRP_CHALLENGE_SCHEMA,
+        )
+        if challenge.get("ChallengeName") != PASSWORD_VERIFIER_CHALLENGE or "ChallengeParameters" not in challenge:
+            raise WaterGuruApiError(f"Unsupported challenge {challenge.get('ChallengeName')}")
+
+        challenge_responses = await loop.run_in_executor(
+            None, aws.process_challenge, challenge["ChallengeParameters"], auth_params
+        )
+        tokens = await self._async_aws_json(
+            self._endpoints.cognito_idp,
+            "AWSCognitoIdentityProviderService.RespondToAuthChallenge",
+            {
+                "ClientId": self.config.client_id,
+                "ChallengeName": PASSWORD_VERIFIER_CHALLENGE,
+                "ChallengeResponses": challenge_responses,
+            },
+            CHALLENGE_RESPONSE_SCHEMA,
+        )
+        if "AuthenticationResult" not in tokens:
+            raise WaterGuruApiError(f"Unsupported challenge {tokens.get('ChallengeName')}")
+
+        self._store_tokens(tokens['AuthenticationResult'])
+
+    async def _async_authenticate(self) -> None:
+        """Make sure the cached Cognito tokens and AWS credentials are usable.
+
+        The user id and the identity id never change for an account, they are
+        only looked up once. Looking up the user and getting the credentials
+        only need the tokens, so they run concurrently.
+        """
+        margin = self.config.expiry_margin
+        if self._auth.credentials_valid(margin) and self._auth.user_id is not None:
+            self.metrics.counters["auth_cache_hits"] += 1
+            return
+
+        if not self._auth.tokens_valid(margin) and not await self._async_refresh_tokens():
+            with self.metrics.timed("srp_auth"):
+                await self._async_srp_login()
+            self.metrics.counters["srp_logins"] += 1
+
+        # a failing step cancels the other one, so nothing is written to the cache after a failed poll
+        try:
+            async with asyncio.TaskGroup() as steps:
+                if self._auth.user_id is None:
+                    steps.create_task(self._async_get_user_id())
+                if not self._auth.credentials_valid(margin):
+                    steps.create_task(self._async_get_credentials())
+        except ExceptionGroup as err:
+            raise err.exceptions[0] from None
+
+    @contextmanager
+    def _tokens_rejected(self) -> Iterator[None]:
+        """Turn a rejection of the cached tokens into a retryable error.
+
+        Only the SRP login rejects the password. A call that uses the tokens
+        is rejected when they were revoked or expired early, so they are
+        dropped with the credentials and the next attempt renews them or
+        logs in again.
+        """
+        try:
+            yield
+        except WaterGuruAuthError as e:
+            self._auth.invalidate_tokens()
+            self._auth.invalidate_credentials()
+            self.metrics.counters["token_rejections"] += 1
+            raise WaterGuruApiError(f"WaterGuru tokens were rejected: {e}") from e
+
+    async def _async_get_user_id(self) -> None:
+        """Look up the Cognito user id used by the dashboard."""
+        with self.metrics.timed("get_user"), self._tokens_rejected():
+            user = await self._async_aws_json(
+                self._endpoints.cognito_idp,
+                "AWSCognitoIdentityProviderService.GetUser",
+                {"AccessToken": self._auth.access_token},
+                GET_USER_SCHEMA,
+            )
+        self._auth.user_id = user['Username']
+
+    async def _async_get_credentials(self) -> None:
+        """Get temporary AWS credentials for the Cognito identity."""
+        with self._tokens_rejected():
+            if self._auth.identity_id is None:
+                with self.metrics.timed("get_id"):
+                    identity_response = await self._async_aws_json(
+                        self._endpoints.cognito_identity,
+                        "AWSCognitoIdentityService.GetId",
+                        {"IdentityPoolId": self.config.identity_pool_id},
+                        GET_ID_SCHEMA,
+                    )
+                self._auth.identity_id = identity_response['IdentityId']
+
+            with self.metrics.timed("get_credentials"):
+                credentials_response = await self._async_aws_json(
+                    self._endpoints.cognito_identity,
+                    "AWSCognitoIdentityService.GetCredentialsForIdentity",
+                    {"IdentityId": self._auth.identity_id, "Logins": {self.config.idp_pool: self._auth.id_token}},
+                    CREDENTIALS_SCHEMA,
+                )
+            self.metrics.counters["credential_refreshes"] += 1
+            credentials = credentials_response['Credentials']
+            self._auth.access_key_id = credentials['AccessKeyId']
+            self._auth.secret_key = credentials['SecretKey']
+            self._auth.session_token = credentials['SessionToken']
+            self._auth.credentials_expiration = datetime.fromtimestamp(credentials['Expiration'], timezone.utc)
+
+    @property
+    def auth_state(self) -> dict[str, Any]:
+        """Return the cached tokens and credentials so they can be persisted."""
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in asdict(self._auth).items()
+        }
+
+    @property
+    def auth_diagnostics(self) -> dict[str, Any]:
+        """Return the state of the auth cache without any secret."""
+        return {
+            "tokens_valid": self._auth.tokens_valid(self.config.expiry_margin),
+            "token_expiration": self._auth.token_expiration.isoformat() if self._auth.token_expiration else None,
+            "has_refresh_token": self._auth.refresh_token is not None,
+            "credentials_valid": self._auth.credentials_valid(self.config.expiry_margin),
+            "credentials_expiration": (
+                self._auth.credentials_expiration.isoformat() if self._auth.credentials_expiration else None
+            ),
+            "has_user_id": self._auth.user_id is not None,
+            "has_identity_id": self._auth.identity_id is not None,
+        }
+
+    def restore_auth_state(self, state: dict[str, Any]) -> None:
+        """Restore tokens and credentials persisted from auth_state."""
+        known = {field.name for field in fields(WaterGuruAuthCache)}
+        self._auth = WaterGuruAuthCache(
+            **{
+                key: datetime.fromisoformat(value) if key.endswith("expiration") and value else value
+                for key, value in state.items()
+                if key in known
+            }
+        )
+
+    async def async_get(self) -> dict[str, WaterGuruDevice]:
         """Get the latest data from the WaterGuru API."""
+        return self.parse_dashboard(await self.async_get_dashboard())
+
+    def parse_dashboard(self, data: dict[str, Any]) -> dict[str, WaterGuruDevice]:
+        """Build the devices from a dashboard payload."""
+        with self.metrics.timed("device_parsing"):
+            try:
+                devices, skipped = parse_water_bodies(data)
+            except vol.Invalid as e:
+                raise WaterGuruApiError(f"Unexpected response from WaterGuru API: {e}") from e
+        if skipped:
+            self.metrics.counters["skipped_water_bodies"] += skipped
+        return devices
+
+    async def async_get_dashboard(self) -> dict[str, Any]:
+        """Get the raw dashboard payload from the WaterGuru API."""
 
         _LOGGER.info("Fetching data from WaterGuru API...")
 
-        region_name = "us-west-2"
-        pool_id = "us-west-2_icsnuWQWw"
-        identity_pool_id = "us-west-2:691e3287-5776-40f2-a502-759de65a8f1c"
-        client_id = "7pk5du7fitqb419oabb3r92lni"
-        idp_pool = "cognito-idp.us-west-2.amazonaws.com/" + pool_id
+        self.metrics.start_poll()
+        with self.metrics.timed("total"):
+            return await self._async_get_dashboard()
+
+    async def _async_get_dashboard(self) -> dict[str, Any]:
+        """Authenticate if needed and invoke the dashboard Lambda."""
+
+        await self._async_authenticate()
+
+        body = json.dumps({"userId":self._auth.user_id, "clientType":"WEB_APP", "clientVersion":"0.2.3"}).encode("utf-8")
+        headers = _sign_request(
+            self._endpoints.dashboard,
+            body,
+            {'User-Agent': 'aws-sdk-iOS/2.24.3 iOS/14.7.1 en_US invoker', 'Content-Type': 'application/x-amz-json-1.0'},
+            self._auth.access_key_id,
+            self._auth.secret_key,
+            self._auth.session_token,
+            self.config.region,
+            "lambda",
+        )
 
-        boto3.setup_default_session(region_name = region_name)
-        client = boto3.client('cognito-idp', region_name=region_name)
-        aws = AWSSRP(username=self._username, password=self._password, pool_id=pool_id, client_id=client_id, client=client)
-        try:
-            tokens = aws.authenticate_user()
-        except botocore.exceptions.ClientError as e:
-            raise WaterGuruApiError(e) from e
-
-        id_token = tokens['AuthenticationResult']['IdToken']
-        refresh_token = tokens['AuthenticationResult']['RefreshToken']
-        access_token = tokens['AuthenticationResult']['AccessToken']
-        token_type = tokens['AuthenticationResult']['TokenType']
-
-        u=Cognito(pool_id,client_id,id_token=id_token,refresh_token=refresh_token,access_token=access_token)
-        user = u.get_user()
-        userId = user._metadata['username']
-
-        boto3.setup_default_session(region_name = region_name)
-        identity_client = boto3.client('cognito-identity', region_name=region_name)
-        identity_response = identity_client.get_id(IdentityPoolId=identity_pool_id)
-        identity_id = identity_response['IdentityId']
-
-        credentials_response = identity_client.get_credentials_for_identity(IdentityId=identity_id,Logins={idp_pool:id_token})
-        credentials = credentials_response['Credentials']
-        access_key_id = credentials['AccessKeyId']
-        secret_key = credentials['SecretKey']
-        service = 'lambda'
-        session_token = credentials['SessionToken']
-        expiration = credentials['Expiration']
-
-        method = 'POST'
-        headers = {'User-Agent': 'aws-sdk-iOS/2.24.3 iOS/14.7.1 en_US invoker', 'Content-Type': 'application/x-amz-json-1.0'}
-        body = {"userId":userId, "clientType":"WEB_APP", "clientVersion":"0.2.3"}
-        service = 'lambda'
-        url = 'https://lambda.us-west-2.amazonaws.com/2015-03-31/functions/prod-getDashboardView/invocations'
-        region = 'us-west-2'
-
-        auth = AWS4Auth(access_key_id, secret_key, region, service, session_token=session_token)
         try:
-            response = requests.request(method, url, auth=auth, json=body, headers=headers, timeout=9.9)
-        except requests.exceptions.Timeout as e:
+            with self.metrics.timed("lambda_invoke"):
+                status, response_headers, raw = await self._async_post(self._endpoints.dashboard, body, headers)
+        except TimeoutError as e:
             raise WaterGuruApiError("Timeout while accessing WaterGuru API") from e
+        except ClientError as e:
+            raise WaterGuruApiError(f"Error while accessing WaterGuru API: {e!r}") from e
 
-        data = response.json()
-        return {waterBodyData['waterBodyId']: WaterGuruDevice(waterBodyData) for waterBodyData in data['waterBodies']}
+        if status in (401, 403):
+            # credentials were revoked early, get new ones on the next poll
+            self._auth.invalidate_credentials()
+            raise WaterGuruApiError(f"WaterGuru API rejected the credentials ({status})")
+        if status == 429:
+            raise WaterGuruThrottledError("WaterGuru API is throttling requests")
+        if status >= 400 or "X-Amz-Function-Error" in response_headers:
+            raise WaterGuruApiError(f"WaterGuru API returned an error ({status})")
+
+        try:
+            with self.metrics.timed("json_decode"):
+                return json_loads(raw)
+        except ValueError as e:
+            raise WaterGuruApiError("Invalid response from WaterGuru API") from e
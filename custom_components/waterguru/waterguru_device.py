@@ -1,72 +1,129 @@
-class WaterGuruDevice:
-    """Representation of a WaterGuru device."""
-
-    def __init__(self, waterBodyData):
-        """Initialize the device."""
-        self._data = waterBodyData
-        self._sensors = dict[str, str]
-        self._standard_sensors = {
-            'temp': self._data.get('waterTemp', None),
-            'rssi': self._data['pods'][0].get('rssiInfo', {}).get('rssi', None),
+from dataclasses import asdict, dataclass
+import hashlib
+
+
+@dataclass(slots=True, frozen=True)
+class WaterGuruMeasurement:
+    """One measurement of a water body."""
+
+    type: str
+    title: str
+    value: float | int | None
+    status: str | None
+    measure_time: str | None
+    desc: str | None
+    unit: str | None
+    dec_places: int | None
+    ideal_min: float | int | None
+    ideal_max: float | int | None
+    alert_condition: str | None
+    advice: str | None
+
+    @classmethod
+    def from_dict(cls, measurement):
+        """Parse a measurement from the dashboard payload."""
+        cfg = measurement.get('cfg') or {}
+        value = measurement.get('floatValue')
+        if value is None:
+            value = measurement.get('intValue')
+
+        advice = None
+        alerts = measurement.get('alerts')
+        if alerts:
+            advice = ((alerts[0].get('advice') or {}).get('action') or {}).get('summary')
+
+        return cls(
+            type=measurement['type'],
+            title=measurement['title'],
+            value=value,
+            status=measurement.get('status'),
+            measure_time=measurement.get('measureTime'),
+            desc=cfg.get('desc'),
+            unit=cfg.get('unit'),
+            dec_places=cfg.get('decPlaces'),
+            ideal_min=cfg.get('idealMin'),
+            ideal_max=cfg.get('idealMax'),
+            alert_condition=measurement.get('firstAlertCondition'),
+            advice=advice,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class WaterGuruPod:
+    """A pod measuring a water body."""
+
+    pod_id: str
+    product: str | None
+    firmware_version: str | None
+    sensors: dict[str, float | int | None]
+
+    @classmethod
+    def from_dict(cls, podData):
+        """Parse a pod from the dashboard payload."""
+        sensors = {
+            'rssi': (podData.get('rssiInfo') or {}).get('rssi'),
         }
-        for r in self._data['pods'][0].get('refillables', []):
+        for r in podData.get('refillables') or []:
             if r['type'] == 'BATT':
-                self._standard_sensors['battery'] = r['pctLeft']
+                sensors['battery'] = r.get('pctLeft')
             if r['type'] == 'LAB':
-                self._standard_sensors['cassette'] = r['pctLeft']
+                sensors['cassette'] = r.get('pctLeft')
                 if 'timeLeftText' in r:
                     number = int(r['timeLeftText'].split()[0])
                     if "weeks" in r['timeLeftText']:
                         number = number * 7
                     elif "months" in r['timeLeftText']:
                         number = number * 30
-                    self._standard_sensors['cassette_days_remaining'] = number
-        self._measurements = {measurement['type']: measurement for measurement in self._data.get('measurements', [])}
-
-    @property
-    def device_id(self):
-        """Return the device ID."""
-        return self._data['waterBodyId']
+                    sensors['cassette_days_remaining'] = number
 
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return f"WaterGuru {self._data['name']}"
+        return cls(
+            pod_id=str(podData['pod']['podId']),
+            product=podData['pod'].get('product'),
+            firmware_version=podData['pod'].get('fwUpdateVersion', None),
+            sensors=sensors,
+        )
 
-    @property
-    def product_name(self):
-        """Return the product name of the device."""
-        return self._data['pods'][0]['pod']['product']
 
-    @property
-    def serial_number(self):
-        """Return the serial number of the device."""
-        return str(self._data['pods'][0]['pod']['podId'])
+class WaterGuruDevice:
+    """Representation of a WaterGuru device.
 
-    @property
-    def firmware_version(self):
-        """Return the firmware version of the device."""
-        return self._data['pods'][0]['pod'].get('fwUpdateVersion', None)
+    Only the fields used by the entities are kept, the raw payload is not.
+    """
 
-    @property
-    def sensors(self):
-        """Return the sensors of the device."""
-        return self._standard_sensors
+    __slots__ = (
+        'device_id',
+        'name',
+        'product_name',
+        'status',
+        'last_measurement_time',
+        'sensors',
+        'pods',
+        'measurements',
+        'fingerprint',
+    )
 
-    @property
-    def measurements(self):
-        """Return the measurements of the device."""
-        return self._measurements
+    def __init__(self, waterBodyData, encoded: bytes):
+        """Initialize the device from a water body and its stable encoding."""
+        # identifies the payload so unchanged water bodies can be skipped
+        self.fingerprint: bytes = hashlib.sha1(encoded).digest()
+        self.device_id: str = waterBodyData['waterBodyId']
+        self.name: str = f"WaterGuru {waterBodyData['name']}"
+        self.status: str | None = waterBodyData['status']
+        self.last_measurement_time: str | None = waterBodyData.get('latestMeasureTime', None)
 
-    @property
-    def status(self):
-        """Return the status of the device."""
-        return self._data['status']
+        self.sensors: dict[str, float | int | None] = {
+            'temp': waterBodyData.get('waterTemp', None),
+        }
+        self.pods: dict[str, WaterGuruPod] = {}
+        for podData in waterBodyData.get('pods', []):
+            pod = WaterGuruPod.from_dict(podData)
+            self.pods[pod.pod_id] = pod
+        self.product_name: str | None = next((pod.product for pod in self.pods.values()), None)
 
-    @property
-    def last_measurement_time(self):
-        """Return the last measurement time."""
-        return self._data.get('latestMeasureTime', None)
+        self.measurements: dict[str, WaterGuruMeasurement] = {
+            measurement['type']: WaterGuruMeasurement.from_dict(measurement)
+            for measurement in waterBodyData.get('measurements', [])
+        }
 
     @property
     def diagnostics(self):
@@ -74,10 +131,9 @@ class WaterGuruDevice:
         return {
             "name": self.name,
             "product_name": self.product_name,
-            "firmware_version": self.firmware_version,
             "status": self.status,
             "last_measurement_time": self.last_measurement_time,
             "standard_sensors": self.sensors,
-            "measurements": self.measurements,
-            "raw_data": self._data
+            "pods": [asdict(pod) for pod in self.pods.values()],
+            "measurements": {key: asdict(m) for key, m in self.measurements.items()},
         }
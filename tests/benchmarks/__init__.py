@@ -0,0 +1,28 @@
+"""Performance benchmarks for the WaterGuru integration.
+
+Each benchmark prints what it measured and fails when it is over a budget
+set well above the expected value, so only real regressions trip it.
+"""
+
+from collections.abc import Awaitable, Callable
+import time
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the fastest of several runs of func, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def async_best_of(func: Callable[[], Awaitable[object]], repeat: int = 5) -> float:
+    """Return the fastest of several runs of an async func, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
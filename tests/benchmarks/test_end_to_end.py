@@ -0,0 +1,100 @@
+"""End-to-end benchmarks of a poll against the local AWS stand-in."""
+
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.waterguru.coordinator import (
+    WaterGuruDataUpdateCoordinator,
+    WaterGuruFetchManager,
+)
+from custom_components.waterguru.sensor import _device_entities
+from custom_components.waterguru.waterguru import WaterGuru
+
+from ..stub import WaterGuruStub
+from . import async_best_of, best_of
+
+# the stub listens on a local socket
+pytestmark = [pytest.mark.benchmark, pytest.mark.usefixtures("socket_enabled")]
+
+LATENCY = 0.02
+WATER_BODIES = 50
+MEASUREMENTS = 8
+
+
+async def test_round_trips(hass: HomeAssistant) -> None:
+    """A cold poll logs in once, the following polls only call the dashboard."""
+    async with WaterGuruStub() as stub:
+        api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+        try:
+            await api.async_get()
+            assert stub.requests == {
+                "InitiateAuth": 1,
+                "RespondToAuthChallenge": 1,
+                "GetUser": 1,
+                "GetId": 1,
+                "GetCredentialsForIdentity": 1,
+                "lambda": 1,
+            }
+            for _ in range(4):
+                await api.async_get()
+        finally:
+            await api.async_close()
+
+    print(f"round trips: {dict(stub.requests)}")
+    assert stub.requests["lambda"] == 5
+    assert stub.round_trips == 10
+
+
+async def test_poll_latency(hass: HomeAssistant) -> None:
+    """Poll latency with a login and with cached credentials."""
+    async with WaterGuruStub(WATER_BODIES, MEASUREMENTS, latency=LATENCY) as stub:
+        api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+        try:
+            start = time.perf_counter()
+            await api.async_get()
+            cold = time.perf_counter() - start
+            warm = await async_best_of(api.async_get)
+        finally:
+            await api.async_close()
+
+    print(f"cold poll: {cold * 1000:.1f} ms, warm poll: {warm * 1000:.1f} ms, {LATENCY * 1000:.0f} ms per request")
+    # the user lookup runs next to the credential requests, so 5 of the 6 requests are on the critical path
+    assert cold < 5 * LATENCY + 1.0
+    assert warm < LATENCY + 0.25
+
+
+async def test_device_parsing(hass: HomeAssistant) -> None:
+    """CPU time spent building the devices of a large dashboard."""
+    async with WaterGuruStub(WATER_BODIES, MEASUREMENTS) as stub:
+        api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+        duration = best_of(lambda: api.parse_dashboard(stub.dashboard))
+        await api.async_close()
+
+    print(f"parsing {WATER_BODIES} water bodies x {MEASUREMENTS} measurements: {duration * 1000:.1f} ms")
+    assert duration < 0.2
+
+
+async def test_entity_update(hass: HomeAssistant) -> None:
+    """Cost of recomputing the state of every sensor after a refresh."""
+    async with WaterGuruStub(WATER_BODIES, MEASUREMENTS) as stub:
+        api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+        coordinator = WaterGuruDataUpdateCoordinator(hass, "benchmark", api, WaterGuruFetchManager(hass))
+        coordinator.data = api.parse_dashboard(stub.dashboard)
+        await api.async_close()
+
+    entities = [
+        (entity, device)
+        for device in coordinator.data.values()
+        for entity in _device_entities(coordinator, device)
+    ]
+
+    def update() -> None:
+        for entity, device in entities:
+            entity._state = entity._project(device)
+
+    duration = best_of(update)
+    print(f"updating {len(entities)} sensors: {duration * 1000:.1f} ms")
+    assert duration / len(entities) < 50e-6
@@ -0,0 +1,60 @@
+"""Benchmark of the time it takes to import the integration."""
+
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+ROOT = Path(__file__).parents[2]
+MODULES = (
+    "custom_components.waterguru",
+    "custom_components.waterguru.config_flow",
+    "custom_components.waterguru.sensor",
+    "custom_components.waterguru.button",
+    "custom_components.waterguru.diagnostics",
+)
+# only needed for the SRP login, which imports them in the executor
+DEFERRED = ("pycognito", "boto3", "botocore")
+
+# Home Assistant and the recorder, a dependency in the manifest, are loaded
+# first so only the integration's own imports are timed
+SCRIPT = f"""
+import importlib
+import sys
+import time
+
+import homeassistant.components.button
+import homeassistant.components.diagnostics
+import homeassistant.components.recorder
+import homeassistant.components.recorder.statistics
+import homeassistant.components.sensor
+import homeassistant.config_entries
+import homeassistant.helpers.update_coordinator
+
+# Home Assistant may load some of them itself, only what the integration adds counts
+before = set(sys.modules)
+start = time.perf_counter()
+for module in {MODULES!r}:
+    importlib.import_module(module)
+print(time.perf_counter() - start)
+added = {{name.partition(".")[0] for name in set(sys.modules) - before}}
+print(",".join(name for name in {DEFERRED!r} if name in added))
+"""
+
+
+def test_import_time() -> None:
+    """Importing the integration on the event loop stays cheap."""
+    timings = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-c", SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        duration, loaded = result.stdout.splitlines()
+        timings.append(float(duration))
+
+    print(f"importing the integration: {min(timings) * 1000:.1f} ms")
+    assert not loaded, f"{loaded} imported at load time"
+    assert min(timings) < 0.25
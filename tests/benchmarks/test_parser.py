@@ -0,0 +1,46 @@
+"""Benchmarks of decoding and parsing a large dashboard."""
+
+import json
+
+import pytest
+
+from custom_components.waterguru import parser
+from custom_components.waterguru.parser import json_loads, parse_water_bodies
+
+from ..stub import dashboard_payload
+from . import best_of
+
+pytestmark = pytest.mark.benchmark
+
+WATER_BODIES = 500
+MEASUREMENTS = 6
+
+
+@pytest.fixture(scope="module")
+def raw() -> bytes:
+    """Return a large dashboard as served by the Lambda, about 1 MB."""
+    return json.dumps(dashboard_payload(WATER_BODIES, MEASUREMENTS)).encode("utf-8")
+
+
+def test_decode(raw: bytes) -> None:
+    """Decoding the payload with orjson beats the standard json module."""
+    duration = best_of(lambda: json_loads(raw))
+    baseline = best_of(lambda: json.loads(raw))
+    print(
+        f"decoding {len(raw) / 1024:.0f} KiB: {duration * 1000:.1f} ms"
+        f" with {'orjson' if parser.orjson else 'json'}, {baseline * 1000:.1f} ms with json"
+    )
+    assert duration < 0.1
+    if parser.orjson is not None:
+        assert duration < baseline
+
+
+def test_parse(raw: bytes) -> None:
+    """Validating and parsing every water body of the payload."""
+    data = json.loads(raw)
+    duration = best_of(lambda: parse_water_bodies(data), repeat=3)
+    devices, skipped = parse_water_bodies(data)
+    print(f"parsing {WATER_BODIES} water bodies x {MEASUREMENTS} measurements: {duration * 1000:.1f} ms")
+    assert len(devices) == WATER_BODIES
+    assert not skipped
+    assert duration < 1.0
@@ -0,0 +1,48 @@
+"""Microbenchmark of the sensor state reads."""
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.waterguru.coordinator import (
+    WaterGuruDataUpdateCoordinator,
+    WaterGuruFetchManager,
+)
+from custom_components.waterguru.parser import parse_water_bodies
+from custom_components.waterguru.sensor import _device_entities
+from custom_components.waterguru.waterguru import WaterGuru
+
+from ..stub import dashboard_payload
+from . import best_of
+
+pytestmark = pytest.mark.benchmark
+
+WATER_BODIES = 50
+MEASUREMENTS = 8
+READS = 20
+
+
+async def test_property_reads(hass: HomeAssistant) -> None:
+    """Reading the state of a sensor only returns precomputed fields."""
+    api = WaterGuru("user@example.com", "secret")
+    coordinator = WaterGuruDataUpdateCoordinator(hass, "benchmark", api, WaterGuruFetchManager(hass))
+    coordinator.data, _ = parse_water_bodies(dashboard_payload(WATER_BODIES, MEASUREMENTS))
+    entities = [
+        entity
+        for device in coordinator.data.values()
+        for entity in _device_entities(coordinator, device)
+    ]
+
+    # the properties Home Assistant reads each time it writes a state
+    def read() -> None:
+        for entity in entities:
+            for _ in range(READS):
+                entity.native_value
+                entity.extra_state_attributes
+                entity.icon
+                entity.available
+
+    duration = best_of(read)
+    per_read = duration / (len(entities) * READS * 4)
+    print(f"reading {len(entities)} sensors: {per_read * 1e9:.0f} ns per property")
+    assert per_read < 5e-6
@@ -0,0 +1,19 @@
+"""Fixtures for the WaterGuru tests."""
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from .stub import WaterGuruStub
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+async def stub(socket_enabled: None) -> AsyncIterator[WaterGuruStub]:
+    """Serve a small dashboard from the local AWS stand-in."""
+    async with WaterGuruStub() as stub:
+        yield stub
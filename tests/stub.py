@@ -0,0 +1,263 @@
+"""Local stand-in for the AWS services behind the WaterGuru API.
+
+Emulates the Cognito user pool (SRP login, token refresh, GetUser), the
+Cognito identity pool and the prod-getDashboardView Lambda closely enough
+for WaterGuru to run against it unchanged, with a configurable latency and
+dashboard size. It counts the requests per AWS operation and the TCP
+connections it accepted.
+
+Run it on its own with ``python -m tests.stub --water-bodies 10``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+from collections import Counter
+import secrets
+import time
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.waterguru.waterguru import WaterGuruEndpoints
+
+# the SRP group used by Cognito (RFC 5054, 3072 bit)
+N_HEX = (
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74020BBEA63B139B22514A08798E3404DD"
+    "EF9519B3CD3A431B302B0A6DF25F14374FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+    "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF0598DA48361C55D39A69163FA8FD24CF5F"
+    "83655D23DCA3AD961C62F356208552BB9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+    "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF6955817183995497CEA956AE515D2261898FA0510"
+    "15728E5A8AAAC42DAD33170D04507A33A85521ABDF1CBA64ECFB850458DBEF0A8AEA71575D060C7DB3970F85A6E1E4C7"
+    "ABF5AE8CDB0933D71E8C94E04A25619DCEE3D2261AD2EE6BF12FFA06D98A0864D87602733EC86A64521F2B18177B200C"
+    "BBE117577A615D6C770988C0BAD946E208E24FA074E5AB3143DB5BFCE0FD108E4B82D120A93AD2CAFFFFFFFFFFFFFFFF"
+)
+
+USER_ID = "stub-user"
+IDENTITY_ID = "us-west-2:stub-identity"
+TOKEN_LIFETIME = 3600
+
+MEASUREMENT_TYPES = ("FREE_CL", "PH", "TA", "CH", "CYA", "SKIMMER_FLOW", "SALT", "PHOS")
+
+
+def dashboard_payload(water_bodies: int = 1, measurements: int = 6, pods: int = 1) -> dict[str, Any]:
+    """Return a dashboard with the given number of water bodies, measurements and pods."""
+    return {
+        "waterBodies": [
+            {
+                "waterBodyId": f"wb{index}",
+                "name": f"Pool {index}",
+                "status": "GREEN",
+                "latestMeasureTime": "2024-05-01T10:00:00.000Z",
+                "waterTemp": 81,
+                "addr1": "1 Stub Street",
+                "pods": [
+                    {
+                        "pod": {"podId": 1000 * index + pod, "product": "SENSE_S2", "fwUpdateVersion": "1.2.3"},
+                        "rssiInfo": {"rssi": -60},
+                        "refillables": [
+                            {"type": "BATT", "pctLeft": 80},
+                            {"type": "LAB", "pctLeft": 50, "timeLeftText": "3 weeks"},
+                        ],
+                    }
+                    for pod in range(pods)
+                ],
+                "measurements": [
+                    {
+                        "type": f"{MEASUREMENT_TYPES[m % len(MEASUREMENT_TYPES)]}{'' if m < len(MEASUREMENT_TYPES) else m}",
+                        "title": f"Measurement {m}",
+                        "floatValue": 7.4,
+                        "status": "GREEN",
+                        "measureTime": "2024-05-01T10:00:00.000Z",
+                        "cfg": {"unit": "ppm", "decPlaces": 1, "desc": "Stub measurement", "idealMin": 7.2, "idealMax": 7.8},
+                        "alerts": [{"advice": {"action": {"summary": "Nothing to do"}}}],
+                    }
+                    for m in range(measurements)
+                ],
+            }
+            for index in range(water_bodies)
+        ]
+    }
+
+
+class WaterGuruStub:
+    """The stand-in server, used as an async context manager."""
+
+    def __init__(
+        self,
+        water_bodies: int = 1,
+        measurements: int = 6,
+        pods: int = 1,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the stub."""
+        self.dashboard = dashboard_payload(water_bodies, measurements, pods)
+        self.latency = latency
+        self.host = host
+        self.port = port
+        # requests per AWS operation, e.g. "InitiateAuth" or "lambda"
+        self.requests: Counter[str] = Counter()
+        # client address of every TCP connection that sent a request
+        self.connections: set[tuple[str, int]] = set()
+        # responses to return instead of the emulated ones, per AWS operation
+        self.overrides: dict[str, Any] = {}
+        # access and id tokens GetUser and GetCredentialsForIdentity accept
+        self._tokens: set[str] = set()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def endpoints(self) -> WaterGuruEndpoints:
+        """Return the endpoints to pass to WaterGuru."""
+        url = f"http://{self.host}:{self.port}"
+        return WaterGuruEndpoints(
+            cognito_idp=f"{url}/cognito-idp/",
+            cognito_identity=f"{url}/cognito-identity/",
+            dashboard=f"{url}/lambda",
+        )
+
+    def revoke_tokens(self) -> None:
+        """Reject the tokens issued so far, as after a global sign-out."""
+        self._tokens.clear()
+
+    @property
+    def round_trips(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    async def __aenter__(self) -> WaterGuruStub:
+        """Start serving."""
+        app = web.Application(middlewares=[self._count])
+        app.router.add_post("/cognito-idp/", self._cognito_idp)
+        app.router.add_post("/cognito-identity/", self._cognito_identity)
+        app.router.add_post("/lambda", self._dashboard)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _count(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        """Count the request and its connection, then wait for the latency."""
+        if request.transport is not None:
+            self.connections.add(request.transport.get_extra_info("peername")[:2])
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    async def _cognito_idp(self, request: web.Request) -> web.Response:
+        """Emulate the Cognito user pool."""
+        operation = request.headers["X-Amz-Target"].rpartition(".")[2]
+        self.requests[operation] += 1
+        if operation in self.overrides:
+            return web.json_response(self.overrides[operation])
+        body = await request.json()
+
+        if operation == "InitiateAuth" and body["AuthFlow"] == "USER_SRP_AUTH":
+            # the password proof is not checked, any B the client can use will do
+            server_b = pow(2, secrets.randbits(256), int(N_HEX, 16))
+            return web.json_response(
+                {
+                    "ChallengeName": "PASSWORD_VERIFIER",
+                    "ChallengeParameters": {
+                        "SALT": secrets.token_hex(16),
+                        "SRP_B": format(server_b, "x"),
+                        "SECRET_BLOCK": base64.standard_b64encode(secrets.token_bytes(64)).decode(),
+                        "USER_ID_FOR_SRP": body["AuthParameters"]["USERNAME"],
+                        "USERNAME": body["AuthParameters"]["USERNAME"],
+                    },
+                }
+            )
+        if operation == "InitiateAuth" and body["AuthFlow"] == "REFRESH_TOKEN_AUTH":
+            return web.json_response({"AuthenticationResult": self._issue_tokens(refresh_token=False)})
+        if operation == "RespondToAuthChallenge":
+            if "PASSWORD_CLAIM_SIGNATURE" not in body["ChallengeResponses"]:
+                return _error("NotAuthorizedException", "Incorrect username or password.")
+            return web.json_response({"AuthenticationResult": self._issue_tokens(refresh_token=True)})
+        if operation == "GetUser":
+            if body["AccessToken"] not in self._tokens:
+                return _error("NotAuthorizedException", "Access Token has been revoked")
+            return web.json_response({"Username": USER_ID, "UserAttributes": []})
+        return _error("InvalidParameterException", f"Unsupported operation {operation}")
+
+    async def _cognito_identity(self, request: web.Request) -> web.Response:
+        """Emulate the Cognito identity pool."""
+        operation = request.headers["X-Amz-Target"].rpartition(".")[2]
+        self.requests[operation] += 1
+        if operation in self.overrides:
+            return web.json_response(self.overrides[operation])
+        body = await request.json()
+        if operation == "GetId":
+            return web.json_response({"IdentityId": IDENTITY_ID})
+        if operation == "GetCredentialsForIdentity":
+            if not set(body["Logins"].values()) <= self._tokens:
+                return _error("NotAuthorizedException", "Invalid login token.")
+            return web.json_response(
+                {
+                    "IdentityId": IDENTITY_ID,
+                    "Credentials": {
+                        "AccessKeyId": "ASIASTUB",
+                        "SecretKey": secrets.token_hex(20),
+                        "SessionToken": secrets.token_hex(32),
+                        "Expiration": time.time() + TOKEN_LIFETIME,
+                    },
+                }
+            )
+        return _error("InvalidParameterException", f"Unsupported operation {operation}")
+
+    async def _dashboard(self, request: web.Request) -> web.Response:
+        """Emulate the prod-getDashboardView Lambda."""
+        self.requests["lambda"] += 1
+        if not request.headers.get("Authorization", "").startswith("AWS4-HMAC-SHA256 "):
+            return web.json_response({"message": "Missing Authentication Token"}, status=403)
+        body = await request.json()
+        if body.get("userId") != USER_ID:
+            return web.json_response({"errorMessage": "Unknown user"}, status=200, headers={"X-Amz-Function-Error": "Unhandled"})
+        return web.json_response(self.dashboard)
+
+    def _issue_tokens(self, refresh_token: bool) -> dict[str, Any]:
+        """Return a Cognito AuthenticationResult."""
+        result = {
+            "IdToken": secrets.token_urlsafe(32),
+            "AccessToken": secrets.token_urlsafe(32),
+            "ExpiresIn": TOKEN_LIFETIME,
+            "TokenType": "Bearer",
+        }
+        self._tokens.update((result["IdToken"], result["AccessToken"]))
+        if refresh_token:
+            result["RefreshToken"] = secrets.token_urlsafe(32)
+        return result
+
+
+def _error(error_type: str, message: str) -> web.Response:
+    """Return an AWS JSON error."""
+    return web.json_response({"__type": error_type, "message": message}, status=400)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    async with WaterGuruStub(args.water_bodies, args.measurements, args.pods, args.latency, args.host, args.port) as stub:
+        print(f"Serving {stub.endpoints}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--water-bodies", type=int, default=1)
+    parser.add_argument("--measurements", type=int, default=6)
+    parser.add_argument("--pods", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    asyncio.run(_serve(parser.parse_args()))
@@ -0,0 +1,31 @@
+"""Tests for the WaterGuru buttons."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.waterguru.button import REFRESH_BUTTON, WaterGuruRefreshButton
+from custom_components.waterguru.coordinator import (
+    WaterGuruDataUpdateCoordinator,
+    WaterGuruFetchManager,
+)
+from custom_components.waterguru.parser import parse_water_bodies
+from custom_components.waterguru.sensor import _device_entities
+from custom_components.waterguru.waterguru import WaterGuru
+
+from .stub import dashboard_payload
+
+
+async def test_refresh_button_names_its_device(hass: HomeAssistant) -> None:
+    """The button describes the water body as fully as its sensors do.
+
+    The button platform sets up first, so the device gets its name from it.
+    """
+    api = WaterGuru("user@example.com", "secret")
+    coordinator = WaterGuruDataUpdateCoordinator(hass, "test", api, WaterGuruFetchManager(hass))
+    coordinator.data, _ = parse_water_bodies(dashboard_payload())
+    device = coordinator.data["wb0"]
+
+    button = WaterGuruRefreshButton(coordinator, device, REFRESH_BUTTON)
+    sensor = _device_entities(coordinator, device)[0]
+
+    assert button.device_info["name"] == device.name
+    assert button.device_info == sensor.device_info
@@ -0,0 +1,47 @@
+"""Tests for the WaterGuru coordinator."""
+
+from typing import Any
+
+import pytest
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.core import HomeAssistant
+
+from custom_components.waterguru.coordinator import (
+    WaterGuruDataUpdateCoordinator,
+    WaterGuruFetchManager,
+)
+from custom_components.waterguru.waterguru import WaterGuru
+
+from .stub import WaterGuruStub
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock: Recorder, enable_custom_integrations: None) -> None:
+    """Set up the recorder the statistics import needs, before Home Assistant starts."""
+
+
+async def test_pending_snapshot_saved_on_unload(
+    hass: HomeAssistant, hass_storage: dict[str, Any], stub: WaterGuruStub
+) -> None:
+    """A reload right after a poll restores its snapshot and reuses its tokens."""
+    fetch_manager = WaterGuruFetchManager(hass)
+    api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+    coordinator = WaterGuruDataUpdateCoordinator(hass, "test", api, fetch_manager)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    # the snapshot is only written after a delay
+    assert "waterguru.test" not in hass_storage
+
+    await coordinator.async_save_snapshot()
+    await api.async_close()
+    assert hass_storage["waterguru.test"]["data"]["dashboard"] == stub.dashboard
+
+    api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+    restored = WaterGuruDataUpdateCoordinator(hass, "test", api, fetch_manager)
+    assert await restored.async_restore()
+    await restored.async_refresh()
+    await api.async_close()
+
+    assert stub.requests["lambda"] == 2
+    assert stub.requests["InitiateAuth"] == 1
@@ -0,0 +1,41 @@
+"""Tests for the WaterGuru diagnostics."""
+
+import json
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.waterguru.const import DOMAIN
+from custom_components.waterguru.coordinator import (
+    WaterGuruDataUpdateCoordinator,
+    WaterGuruFetchManager,
+)
+from custom_components.waterguru.diagnostics import async_get_config_entry_diagnostics
+from custom_components.waterguru.parser import parse_water_bodies
+from custom_components.waterguru.waterguru import WaterGuru
+
+from .stub import dashboard_payload
+
+
+async def test_water_body_ids_are_redacted(hass: HomeAssistant) -> None:
+    """No water body id shows up, including in the learned poll cadence."""
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    entry.add_to_hass(hass)
+    api = WaterGuru("user@example.com", "secret")
+    coordinator = WaterGuruDataUpdateCoordinator(hass, entry.entry_id, api, WaterGuruFetchManager(hass))
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    payload = dashboard_payload(water_bodies=2)
+    for measured in ("2024-05-01T10:00:00.000Z", "2024-05-01T11:00:00.000Z"):
+        for water_body in payload["waterBodies"]:
+            water_body["latestMeasureTime"] = measured
+        coordinator.data, _ = parse_water_bodies(payload)
+        coordinator.scheduler.observe(coordinator.data)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["poll_schedule"]["cadence"] == [3600.0, 3600.0]
+    encoded = json.dumps(diagnostics, default=str)
+    assert "wb0" not in encoded
+    assert "wb1" not in encoded
@@ -0,0 +1,26 @@
+"""Tests for the WaterGuru sensors."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.waterguru.coordinator import (
+    WaterGuruDataUpdateCoordinator,
+    WaterGuruFetchManager,
+)
+from custom_components.waterguru.parser import parse_water_bodies
+from custom_components.waterguru.sensor import _device_entity_factories
+from custom_components.waterguru.waterguru import WaterGuru
+
+from .stub import dashboard_payload
+
+
+async def test_factory_unique_ids(hass: HomeAssistant) -> None:
+    """The unique id known before a sensor is built is the one it gets."""
+    api = WaterGuru("user@example.com", "secret")
+    coordinator = WaterGuruDataUpdateCoordinator(hass, "test", api, WaterGuruFetchManager(hass))
+    coordinator.data, _ = parse_water_bodies(dashboard_payload(water_bodies=2, measurements=8, pods=2))
+
+    for device in coordinator.data.values():
+        factories = _device_entity_factories(coordinator, device)
+        unique_ids = [unique_id for unique_id, _ in factories]
+        assert len(set(unique_ids)) == len(unique_ids)
+        assert [factory().unique_id for _, factory in factories] == unique_ids
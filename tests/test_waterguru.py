@@ -0,0 +1,82 @@
+"""Tests for the WaterGuru API client."""
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.waterguru.waterguru import WaterGuru, WaterGuruApiError, WaterGuruAuthError
+
+from .stub import WaterGuruStub
+
+POLLS = 10
+
+
+@pytest.mark.parametrize("shared_session", [False, True], ids=["own_session", "shared_session"])
+async def test_polls_reuse_connections(hass: HomeAssistant, stub: WaterGuruStub, shared_session: bool) -> None:
+    """Polls after the first one reuse the pooled keep-alive connections."""
+    session = async_get_clientsession(hass) if shared_session else None
+    api = WaterGuru("user@example.com", "secret", session=session, endpoints=stub.endpoints)
+    try:
+        await api.async_get()
+        # the user lookup and the identity requests of the login run concurrently
+        login_connections = len(stub.connections)
+        assert 1 <= login_connections <= 2
+
+        for _ in range(POLLS - 1):
+            await api.async_get()
+    finally:
+        await api.async_close()
+
+    assert stub.requests["lambda"] == POLLS
+    assert len(stub.connections) == login_connections
+
+
+async def test_revoked_tokens_are_renewed(hass: HomeAssistant, stub: WaterGuruStub) -> None:
+    """Revoked tokens fail one poll with a retryable error, the next one renews them."""
+    api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+    try:
+        await api.async_get()
+        stub.revoke_tokens()
+        # the credentials expired, getting new ones needs the revoked id token
+        api._auth.invalidate_credentials()
+
+        with pytest.raises(WaterGuruApiError) as err:
+            await api.async_get()
+        assert not isinstance(err.value, WaterGuruAuthError)
+
+        await api.async_get()
+    finally:
+        await api.async_close()
+
+    # renewed with the refresh token, without a new SRP login
+    assert stub.requests["RespondToAuthChallenge"] == 1
+    assert stub.requests["InitiateAuth"] == 2
+    assert stub.requests["lambda"] == 2
+
+
+@pytest.mark.parametrize(
+    ("operation", "response"),
+    [
+        ("InitiateAuth", {"ChallengeName": "PASSWORD_VERIFIER"}),
+        ("RespondToAuthChallenge", {"AuthenticationResult": {"IdToken": "id"}}),
+        ("GetUser", {"UserAttributes": []}),
+        ("GetId", {}),
+        ("GetCredentialsForIdentity", {"Credentials": None}),
+        ("GetCredentialsForIdentity", {"Credentials": {"AccessKeyId": "key", "SecretKey": "secret"}}),
+    ],
+)
+async def test_malformed_auth_response(
+    hass: HomeAssistant, stub: WaterGuruStub, operation: str, response: object
+) -> None:
+    """A malformed AWS response fails the poll with a retryable error."""
+    stub.overrides[operation] = response
+    api = WaterGuru("user@example.com", "secret", endpoints=stub.endpoints)
+    try:
+        with pytest.raises(WaterGuruApiError) as err:
+            await api.async_get()
+    finally:
+        await api.async_close()
+
+    assert not isinstance(err.value, WaterGuruAuthError)
+    assert stub.requests["lambda"] == 0